@@ -9,8 +9,10 @@ setup(
     install_requires=[
         'whisperx',
         'ffmpeg',
-        'ffmpeg-python'
+        'ffmpeg-python',
+        'numpy'
     ],
+    python_requires=">=3.10",
     description="Automatically generate and embed subtitles into your videos",
     entry_points={
         'console_scripts': ['visub=visub.cli:main'],
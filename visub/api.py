@@ -5,51 +5,450 @@ like Flask, FastAPI, or Django.
 """
 
 import os
+import re
 import tempfile
 import json
-from typing import Dict, List, Optional, Union
+import hashlib
+import dataclasses
+import functools
+import shutil
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Dict, Generator, Iterator, List, Optional, Set, Tuple, Union
 from pathlib import Path
 
+import ffmpeg
+import numpy as np
+
 from .config import (
     SubtitleConfig, SpeakerStyle, SubtitlePosition, FontFamily, TextEffect, AnimationStyle,
     create_multi_speaker_config, create_auto_speaker_config, create_viral_preset_styles, 
     get_viral_color_palette, hex_to_ass_color
 )
-from .transcribe import word_transcribe
-from .cli import get_audio, get_subtitles
+from .transcribe import word_transcribe_batch
+from .cli import get_audio, get_subtitles, subtitled_output
+from .utils import DEFAULT_COMPUTE_TYPES, LANGUAGES, detect_video_encoder, filename
+
+logger = logging.getLogger(__name__)
+
+# Frontend names to backend enums, used when parsing speaker configurations
+_FONT_MAP = {
+    'Impact': FontFamily.IMPACT,
+    'Arial Black': FontFamily.ARIAL_BLACK,
+    'Bebas Neue': FontFamily.BEBAS_NEUE,
+    'Montserrat Black': FontFamily.MONTSERRAT_BLACK,
+    'Oswald': FontFamily.OSWALD,
+    'Roboto Black': FontFamily.ROBOTO_BLACK,
+    'Anton': FontFamily.ANTON,
+    'Barlow': FontFamily.BARLOW,
+    'Lato Black': FontFamily.LATO_BLACK,
+    'Open Sans': FontFamily.OPEN_SANS_BOLD,
+    'Nunito Black': FontFamily.NUNITO_BLACK,
+    'Arial': FontFamily.ARIAL,
+    'Helvetica': FontFamily.HELVETICA
+}
+
+_POSITION_MAP = {
+    'bottom_left': SubtitlePosition.BOTTOM_LEFT,
+    'bottom_center': SubtitlePosition.BOTTOM_CENTER,
+    'bottom_right': SubtitlePosition.BOTTOM_RIGHT,
+    'middle_left': SubtitlePosition.MIDDLE_LEFT,
+    'middle_center': SubtitlePosition.MIDDLE_CENTER,
+    'middle_right': SubtitlePosition.MIDDLE_RIGHT,
+    'top_left': SubtitlePosition.TOP_LEFT,
+    'top_center': SubtitlePosition.TOP_CENTER,
+    'top_right': SubtitlePosition.TOP_RIGHT
+}
+
+# Whisper model names accepted for transcription
+_SUPPORTED_MODELS = (
+    "tiny", "tiny.en", "base", "base.en", "small", "small.en",
+    "medium", "medium.en", "large-v1", "large-v2", "large-v3",
+    "large", "distil-large-v2", "distil-medium.en", "distil-small.en",
+    "distil-large-v3", "large-v3-turbo", "turbo"
+)
+
+# Subtitle positions offered to the frontend, as (value, label)
+_POSITIONS = (
+    ("bottom_left", "Bottom Left"),
+    ("bottom_center", "Bottom Center"),
+    ("bottom_right", "Bottom Right"),
+    ("middle_left", "Middle Left"),
+    ("middle_center", "Middle Center"),
+    ("middle_right", "Middle Right"),
+    ("top_left", "Top Left"),
+    ("top_center", "Top Center"),
+    ("top_right", "Top Right")
+)
+
+_VALID_POSITIONS = frozenset(value for value, _ in _POSITIONS)
+
+# Accepted speaker colors: #RRGGBB or ASS &HBBGGRR with optional alpha byte.
+# Public so the web app validates request models against the same pattern
+COLOR_RE = re.compile(r'^(?:#[0-9A-Fa-f]{6}|&H(?:[0-9A-Fa-f]{2})?[0-9A-Fa-f]{6})$')
+
+_TEXT_EFFECT_MAP = {
+    'none': TextEffect.NONE,
+    'glow': TextEffect.GLOW,
+    'shadow': TextEffect.SHADOW,
+    'outline': TextEffect.OUTLINE,
+    'outline_glow': TextEffect.OUTLINE_GLOW,
+    'double_outline': TextEffect.DOUBLE_OUTLINE,
+    'drop_shadow': TextEffect.DROP_SHADOW
+}
+
+_ANIMATION_MAP = {
+    'none': AnimationStyle.NONE,
+    'fade_in': AnimationStyle.FADE_IN,
+    'slide_up': AnimationStyle.SLIDE_UP,
+    'scale_in': AnimationStyle.SCALE_IN,
+    'type_writer': AnimationStyle.TYPE_WRITER,
+    'bounce': AnimationStyle.BOUNCE,
+    'pulse': AnimationStyle.PULSE
+}
+
+# Base style for frontend speaker configurations. It matches the SpeakerStyle
+# defaults except for position, which the frontend defaults to bottom_center.
+_DEFAULT_SPEAKER_STYLE = SpeakerStyle(position=SubtitlePosition.BOTTOM_CENTER)
+
+_SPEAKER_STYLE_FIELDS = frozenset(f.name for f in dataclasses.fields(SpeakerStyle))
+
+# Speaker settings given as frontend names, with their lookup map and fallback
+_ENUM_FIELDS = {
+    'font_family': (_FONT_MAP, FontFamily.IMPACT),
+    'position': (_POSITION_MAP, SubtitlePosition.BOTTOM_CENTER),
+    'text_effect': (_TEXT_EFFECT_MAP, TextEffect.OUTLINE),
+    'animation': (_ANIMATION_MAP, AnimationStyle.NONE)
+}
+
+_PRESET_DESCRIPTIONS = {
+    "tiktok_classic": "Bold Impact font with black outline - perfect for TikTok",
+    "youtube_viral": "Eye-catching yellow text for maximum attention",
+    "instagram_reel": "Modern style with trendy glow effect",
+    "podcast_clean": "Clean, readable style for long-form content",
+    "gaming_streamer": "High-energy style popular with gamers",
+    "minimalist": "Simple, elegant styling for sophisticated content",
+    "news_documentary": "Professional style with background box",
+    "retro_vintage": "Stylized retro look with unique flair"
+}
+
+# Display names for get_viral_color_palette(), in the same order
+_COLOR_NAMES = (
+    "White", "Yellow", "Green", "Blue", "Magenta",
+    "Lime", "Pink", "Orange", "Purple", "Cyan"
+)
+
+# Option tables behind the metadata getters, built once at import as (value,
+# label) style tuples. The getters build new lists and dicts from them on each
+# call, so no caller can change what later callers receive.
+_FONT_OPTIONS = tuple((font.name.lower(), font.value) for font in FontFamily)
+_TEXT_EFFECT_OPTIONS = tuple((effect.value, effect.value.replace("_", " ").title()) for effect in TextEffect)
+_ANIMATION_OPTIONS = tuple((anim.value, anim.value.replace("_", " ").title()) for anim in AnimationStyle)
+_COLOR_OPTIONS = tuple(zip(get_viral_color_palette(), _COLOR_NAMES))
+_PRESET_PREVIEWS = tuple(
+    (name, (
+        ("font_family", style.font_family.value),
+        ("font_size", style.font_size),
+        ("primary_color", style.primary_color),
+        ("outline_color", style.outline_color),
+        ("text_effect", style.text_effect.value),
+        ("all_caps", style.all_caps),
+        ("bold", style.bold)
+    ))
+    for name, style in create_viral_preset_styles().items()
+)
+
+# Speaker settings holding colors that may arrive as hex (#RRGGBB)
+_COLOR_FIELDS = (
+    'primary_color', 'outline_color', 'shadow_color', 'background_color',
+    'highlight_color', 'highlight_outline_color'
+)
+
+
+def _extract_speakers(transcription_result: Dict) -> Set[str]:
+    """Return the speaker labels assigned to words in a transcription."""
+    return {
+        word["speaker"]
+        for segment in transcription_result.get("segments", [])
+        for word in segment.get("words", ())
+        if word.get("speaker")
+    }
+
+
+def _subtitled_video_paths(subtitle_paths: Dict[str, str], output_dir: str) -> Dict[str, str]:
+    """Map each original video to the path its subtitled copy is written to."""
+    # Use MP4 as intermediate format (legal for processing, not distribution)
+    return {
+        original_path: os.path.join(output_dir, f"{filename(original_path)}_subtitled.mp4")
+        for original_path in subtitle_paths
+    }
 
 
 class VisubAPI:
     """Main API class for video subtitle generation."""
     
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(self, temp_dir: Optional[str] = None, transcription_cache_size: int = 256, release_models: bool = True):
         """
         Initialize the Visub API.
         
         Args:
             temp_dir: Directory for temporary files. Uses system temp if None.
+            transcription_cache_size: Most transcriptions kept in temp_dir for
+                reuse, least recently used dropped first. 0 disables the cache.
+            release_models: Free the WhisperX models after each transcription
+                batch, as the CLI does. Pass False in a long-lived process that
+                can spare the GPU memory, to keep them loaded for the next call.
         """
         self.temp_dir = temp_dir or tempfile.gettempdir()
+        self.transcription_cache_size = transcription_cache_size
+        self.release_models = release_models
+    
+    @property
+    def _hwenc(self) -> str:
+        """
+        Hardware H.264 encoder for burn-ins, falling back to libx264.
+        
+        Probed on the first burn-in rather than here, so processes that never
+        render (web workers, transcription-only workers) don't pay for it.
+        """
+        return detect_video_encoder()
     
     def process_video(
         self, 
         video_path: str, 
         output_dir: str,
         subtitle_config: Dict,
-        transcription_config: Optional[Dict] = None
+        transcription_config: Optional[Dict] = None,
+        output_stream: Optional[BinaryIO] = None
     ) -> Dict:
         """
         Process a video file and generate subtitles with custom styling.
         
+        When subtitle_config lists explicit speakers, their styles are used as
+        given and no speaker pre-pass is run to auto-generate styles.
+        
         Args:
             video_path: Path to the input video file
             output_dir: Directory to save output files
             subtitle_config: Dictionary containing subtitle styling configuration
             transcription_config: Optional transcription settings
+            output_stream: If given, the subtitled video is written to this binary
+                stream as fragmented MP4 instead of to a file in output_dir
         
         Returns:
             Dictionary with results including paths to generated files
         """
+        if output_stream is None:
+            for event in self.iprocess_video(video_path, output_dir, subtitle_config, transcription_config):
+                pass
+            return event['result']
+        
+        config, subtitle_paths, detected_speakers = self._generate_subtitles(
+            video_path, output_dir, subtitle_config, transcription_config
+        )
+        for original_path, ass_path in subtitle_paths.items():
+            self._stream_subtitles(original_path, ass_path, output_stream)
+        
+        return self._build_results(video_path, config, subtitle_paths, {}, detected_speakers)
+    
+    def iprocess_video(
+        self,
+        video_path: str,
+        output_dir: str,
+        subtitle_config: Dict,
+        transcription_config: Optional[Dict] = None
+    ) -> Iterator[Dict]:
+        """
+        Process a video like process_video, yielding progress events as it goes.
+        
+        Events are dictionaries with a 'stage' of 'audio', 'transcribe',
+        'subtitle' or 'burn' and the 'path' that stage produced or worked on.
+        The final event has stage 'done' and carries the process_video results
+        under 'result'. Suitable for streaming progress to web clients.
+        
+        Args:
+            video_path: Path to the input video file
+            output_dir: Directory to save output files
+            subtitle_config: Dictionary containing subtitle styling configuration
+            transcription_config: Optional transcription settings
+        
+        Yields:
+            Progress event dictionaries
+        """
+        config, subtitle_paths, detected_speakers = yield from self._subtitle_stages(
+            video_path, output_dir, subtitle_config, transcription_config
+        )
+        
+        # Generate final video with embedded subtitles
+        burned = {}
+        if subtitle_paths:
+            # Each burn-in is an ffmpeg subprocess, so threads run them concurrently
+            workers = min(len(subtitle_paths), os.cpu_count() or 1)
+            output_paths = _subtitled_video_paths(subtitle_paths, output_dir)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(self._burn_subtitles, original_path, ass_path, output_paths[original_path]): original_path
+                    for original_path, ass_path in subtitle_paths.items()
+                }
+                for future in as_completed(futures):
+                    burned[futures[future]] = future.result()
+                    yield {'stage': 'burn', 'path': burned[futures[future]]}
+        
+        # Report videos in input order rather than completion order
+        video_paths = {original_path: burned[original_path] for original_path in subtitle_paths}
+        yield {
+            'stage': 'done',
+            'path': video_path,
+            'result': self._build_results(video_path, config, subtitle_paths, video_paths, detected_speakers)
+        }
+    
+    def generate_subtitles(
+        self,
+        video_path: str,
+        output_dir: str,
+        subtitle_config: Dict,
+        transcription_config: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Run the transcription half of process_video: write the subtitle files
+        without rendering any video.
+        
+        Together with burn_subtitles this lets the GPU-bound and the ffmpeg-bound
+        halves run in different workers. Arguments are the same as process_video.
+        
+        Returns:
+            process_video results with empty 'video_files', to pass to burn_subtitles
+        """
+        config, subtitle_paths, detected_speakers = self._generate_subtitles(
+            video_path, output_dir, subtitle_config, transcription_config
+        )
+        return self._build_results(video_path, config, subtitle_paths, {}, detected_speakers)
+    
+    def burn_subtitles(self, results: Dict, output_dir: str) -> Dict:
+        """
+        Render the subtitled videos for generate_subtitles results.
+        
+        Args:
+            results: Results returned by generate_subtitles
+            output_dir: Directory to save the subtitled videos
+        
+        Returns:
+            The results with 'video_files' filled in, as process_video returns them
+        """
+        subtitle_paths = results['subtitle_files']
+        video_paths = {}
+        if subtitle_paths:
+            workers = min(len(subtitle_paths), os.cpu_count() or 1)
+            output_paths = _subtitled_video_paths(subtitle_paths, output_dir)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    original_path: pool.submit(self._burn_subtitles, original_path, ass_path, output_paths[original_path])
+                    for original_path, ass_path in subtitle_paths.items()
+                }
+                video_paths = {original_path: future.result() for original_path, future in futures.items()}
+        
+        return {**results, 'video_files': video_paths}
+    
+    def process_videos(
+        self,
+        video_paths: List[str],
+        output_dir: str,
+        subtitle_config: Dict,
+        transcription_config: Optional[Dict] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """
+        Process several video files in parallel.
+        
+        On CPU each video runs through process_video in its own process. On
+        CUDA a single GPU is shared, so the work is pipelined in three stages:
+        the next video's audio is decoded on a decoder thread while the current
+        one is transcribed, and the ffmpeg burn-ins of finished videos run in a
+        worker pool, so the GPU never waits on ffmpeg.
+        
+        Args:
+            video_paths: Paths to the input video files
+            output_dir: Directory to save output files
+            subtitle_config: Dictionary containing subtitle styling configuration
+            transcription_config: Optional transcription settings
+            max_workers: Number of parallel workers. Defaults to half the CPU count.
+        
+        Returns:
+            Dictionary of {video_path: process_video results}
+        """
+        trans_config = transcription_config or {}
+        max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        
+        if trans_config.get('device', 'cpu') != 'cuda':
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    path: pool.submit(self.process_video, path, output_dir, subtitle_config, transcription_config)
+                    for path in video_paths
+                }
+                return {path: future.result() for path, future in futures.items()}
+        
+        # ffmpeg runs as a subprocess, so threads are enough to overlap burn-ins
+        # and the audio decode of the next video with the current transcription
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool, \
+                ThreadPoolExecutor(max_workers=1) as decoder:
+            next_audios = decoder.submit(get_audio, video_paths[:1])
+            for i, path in enumerate(video_paths):
+                audios = next_audios.result()
+                if i + 1 < len(video_paths):
+                    next_audios = decoder.submit(get_audio, [video_paths[i + 1]])
+                
+                config, subtitle_paths, detected_speakers = self._generate_subtitles(
+                    path, output_dir, subtitle_config, transcription_config, audios
+                )
+                output_paths = _subtitled_video_paths(subtitle_paths, output_dir)
+                burns = {
+                    original_path: pool.submit(self._burn_subtitles, original_path, ass_path, output_paths[original_path])
+                    for original_path, ass_path in subtitle_paths.items()
+                }
+                pending[path] = (config, subtitle_paths, burns, detected_speakers)
+            
+            results = {}
+            for path, (config, subtitle_paths, burns, detected_speakers) in pending.items():
+                video_files = {original_path: future.result() for original_path, future in burns.items()}
+                results[path] = self._build_results(path, config, subtitle_paths, video_files, detected_speakers)
+        
+        return results
+    
+    def _generate_subtitles(
+        self,
+        video_path: str,
+        output_dir: str,
+        subtitle_config: Dict,
+        transcription_config: Optional[Dict] = None,
+        audios: Optional[Dict[str, np.ndarray]] = None
+    ) -> Tuple[SubtitleConfig, Dict[str, str], Set[str]]:
+        """
+        Extract audio, transcribe it and write the subtitle files for a video.
+        
+        Pass audios, as returned by get_audio, to reuse audio decoded ahead of time.
+        """
+        stages = self._subtitle_stages(video_path, output_dir, subtitle_config, transcription_config, audios)
+        while True:
+            try:
+                next(stages)
+            except StopIteration as done:
+                return done.value
+    
+    def _subtitle_stages(
+        self,
+        video_path: str,
+        output_dir: str,
+        subtitle_config: Dict,
+        transcription_config: Optional[Dict] = None,
+        audios: Optional[Dict[str, np.ndarray]] = None
+    ) -> Generator[Dict, None, Tuple[SubtitleConfig, Dict[str, str], Set[str]]]:
+        """
+        Generator behind _generate_subtitles.
+        
+        Yields a progress event after the audio, transcribe and subtitle stages
+        and returns the same (config, subtitle_paths, detected_speakers) tuple.
+        """
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
@@ -58,83 +457,137 @@ class VisubAPI:
         trans_config = transcription_config or {}
         
         # Extract audio
-        audio_paths = get_audio([video_path])
+        if audios is None:
+            audios = get_audio([video_path])
+        yield {'stage': 'audio', 'path': video_path}
         
         # Create transcription function with config
-        def transcribe_func(audio_path):
-            return word_transcribe(
-                audio_path,
-                model=trans_config.get('model', 'base'),
-                device=trans_config.get('device', 'cpu'),
-                batch_size=trans_config.get('batch_size', 16),
-                compute_type=trans_config.get('compute_type', 'int8'),
-                language=trans_config.get('language', 'auto'),
-                enable_diarization=config.enable_speaker_detection,
-                hf_token=trans_config.get('hf_token') or os.getenv('HF_TOKEN')
-            )
-        
-        # If speaker detection is enabled, first run transcription to detect speakers
+        device = trans_config.get('device', 'cpu')
+        transcribe_options = {
+            'model': trans_config.get('model', 'base'),
+            'device': device,
+            'batch_size': trans_config.get('batch_size', 16),
+            'compute_type': (
+                trans_config.get('compute_type')
+                or os.getenv('VISUB_COMPUTE_TYPE')
+                or DEFAULT_COMPUTE_TYPES.get(device, 'int8')
+            ),
+            'language': trans_config.get('language', 'auto'),
+            'enable_diarization': config.enable_speaker_detection,
+            'hf_token': trans_config.get('hf_token') or os.getenv('HF_TOKEN')
+        }
+        
+        # Transcribe every audio in one batch up front so the speaker pre-pass and
+        # get_subtitles share one ASR run. Arrays aren't hashable, but they stay
+        # alive in `audios` for the whole call, so key the results by id().
+        audio_list = list(audios.values())
+        transcriptions = {
+            id(audio): result
+            for audio, result in zip(audio_list, self._cached_transcribe(audio_list, transcribe_options))
+        }
+        yield {'stage': 'transcribe', 'path': video_path}
+        
+        def transcribe_func(audio):
+            return transcriptions[id(audio)]
+        
+        def scan_speakers():
+            return set().union(*(_extract_speakers(transcribe_func(audio)) for audio in audios.values()))
+        
+        # Auto-generated speaker styles must exist before the ASS file is written,
+        # so only pre-scan for speakers when the caller gave no custom styles
         detected_speakers = set()
-        if config.enable_speaker_detection:
-            print("DEBUG: Pre-processing to detect speakers...")
-            transcription_result = transcribe_func(list(audio_paths.values())[0])
-            for segment in transcription_result.get("segments", []):
-                if "words" in segment:
-                    for word in segment["words"]:
-                        if word.get("speaker"):
-                            detected_speakers.add(word["speaker"])
+        has_custom_styles = bool(config.speaker_styles)
+        if config.enable_speaker_detection and not has_custom_styles:
+            logger.debug("Pre-processing to detect speakers...")
+            detected_speakers = scan_speakers()
             
-            print(f"DEBUG: Detected speakers: {detected_speakers}")
-            print(f"DEBUG: Total speakers found: {len(detected_speakers)}")
+            logger.debug("Detected speakers: %s", detected_speakers)
+            logger.debug("Total speakers found: %s", len(detected_speakers))
             
             # Only use auto-config with random colors if no custom speaker styles were provided
-            if not config.speaker_styles:
-                if detected_speakers:
-                    print("DEBUG: No custom speaker styles provided, creating auto speaker config with random colors")
-                    auto_config = create_auto_speaker_config(list(detected_speakers))
-                    config.speaker_styles = auto_config.speaker_styles
-                else:
-                    print("DEBUG: No speakers detected and no custom styles, using default styling")
+            if detected_speakers:
+                logger.debug("No custom speaker styles provided, creating auto speaker config with random colors")
+                auto_config = create_auto_speaker_config(list(detected_speakers))
+                config.speaker_styles = auto_config.speaker_styles
             else:
-                print(f"DEBUG: Using provided custom speaker styles for speakers: {list(config.speaker_styles.keys())}")
+                logger.debug("No speakers detected and no custom styles, using default styling")
+        
+        # Generate subtitles
+        subtitle_paths = get_subtitles(audios, output_dir, transcribe_func, config)
+        for ass_path in subtitle_paths.values():
+            yield {'stage': 'subtitle', 'path': ass_path}
+        
+        if config.enable_speaker_detection and has_custom_styles:
+            # Custom styles were given: report speakers from the memoized transcription
+            detected_speakers = scan_speakers()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using provided custom speaker styles for speakers: %s", list(config.speaker_styles.keys()))
                 if detected_speakers:
-                    print(f"DEBUG: Detected speakers in audio: {detected_speakers}")
+                    logger.debug("Detected speakers in audio: %s", detected_speakers)
                     # Check if any detected speakers match our custom styles
                     matching_speakers = [s for s in detected_speakers if s in config.speaker_styles]
                     if matching_speakers:
-                        print(f"DEBUG: Found matching custom styles for speakers: {matching_speakers}")
+                        logger.debug("Found matching custom styles for speakers: %s", matching_speakers)
                     else:
-                        print("DEBUG: No detected speakers match custom style IDs - will use first custom style as fallback")
+                        logger.debug("No detected speakers match custom style IDs - will use first custom style as fallback")
         
-        # Generate subtitles
-        subtitle_paths = get_subtitles(audio_paths, output_dir, transcribe_func, config)
+        return config, subtitle_paths, detected_speakers
+    
+    def _burn_subtitles(self, original_path: str, ass_path: str, output_video_path: str) -> str:
+        """Render the ASS subtitles onto the video and return the output path."""
+        logger.info("Adding subtitles to %s...", filename(original_path))
         
-        # Generate final video with embedded subtitles
-        video_paths = {}
-        for original_path, ass_path in subtitle_paths.items():
-            import ffmpeg
-            from .utils import filename
-            
-            # Use MP4 as intermediate format (legal for processing, not distribution)
-            output_video_path = os.path.join(output_dir, f"{filename(original_path)}_subtitled.mp4")
-            
-            print(f"Adding subtitles to {filename(original_path)}...")
-            
-            video = ffmpeg.input(original_path)
-            audio = video.audio
-            
-            # Apply subtitles - subtitle filter requires reencoding
-            # Preserve original format but must recompute video due to subtitle overlay
-            ffmpeg.concat(
-                video.filter('subtitles', ass_path), 
-                audio, 
-                v=1, 
-                a=1
-            ).output(output_video_path).run(quiet=False, overwrite_output=True)
-            
-            video_paths[original_path] = output_video_path
-            print(f"Saved subtitled video to {output_video_path}")
+        # Move the moov atom to the front so downloads can start playing immediately.
+        # Encodes may run concurrently, so skip the progress lines and keep only
+        # errors, which ffmpeg.Error then carries in its stderr
+        subtitled_output(
+            original_path, ass_path, output_video_path, self._hwenc, movflags='+faststart'
+        ).global_args('-nostats', '-loglevel', 'error').run(capture_stderr=True, overwrite_output=True)
         
+        logger.info("Saved subtitled video to %s", output_video_path)
+        return output_video_path
+    
+    def _stream_subtitles(self, original_path: str, ass_path: str, output_stream: BinaryIO):
+        """Render the ASS subtitles onto the video and write it to a binary stream."""
+        logger.info("Streaming subtitled %s...", filename(original_path))
+        
+        # A pipe can't be seeked back to write the moov atom, so emit fragmented MP4
+        process = subtitled_output(
+            original_path, ass_path, 'pipe:1', self._hwenc,
+            format='mp4', movflags='frag_keyframe+empty_moov'
+        ).global_args('-nostats', '-loglevel', 'error').run_async(
+            pipe_stdout=True, pipe_stderr=True, overwrite_output=True
+        )
+        
+        def read_stderr():
+            with process.stderr:
+                return process.stderr.read()
+        
+        # Drain stderr on the side so ffmpeg can't block on a full pipe
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            stderr = pool.submit(read_stderr)
+            try:
+                shutil.copyfileobj(process.stdout, output_stream)
+            except BaseException:
+                # The stream failed (e.g. the client went away), so stop encoding
+                process.kill()
+                raise
+            finally:
+                process.stdout.close()
+                process.wait()
+        
+        if process.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, stderr.result())
+    
+    def _build_results(
+        self,
+        video_path: str,
+        config: SubtitleConfig,
+        subtitle_paths: Dict[str, str],
+        video_paths: Dict[str, str],
+        detected_speakers: Set[str]
+    ) -> Dict:
+        """Assemble the process_video result dictionary."""
         # Prepare results
         results = {
             'status': 'success',
@@ -151,6 +604,77 @@ class VisubAPI:
         
         return results
     
+    def _cached_transcribe(self, audios: List[np.ndarray], options: Dict) -> List[Dict]:
+        """
+        Transcribe audios, reusing previous results stored in temp_dir.
+        
+        Results are keyed by the audio content and the transcription options,
+        so re-processing the same video with different styling skips ASR.
+        All cache misses are transcribed in a single batch so the models load once.
+        At most transcription_cache_size results are kept.
+        """
+        if self.transcription_cache_size <= 0:
+            return word_transcribe_batch(audios, release_models=self.release_models, **options)
+        
+        # The token itself stays out of the key, but whether one is present
+        # does matter: without it word_transcribe_batch simulates the speakers
+        key_options = {k: v for k, v in options.items() if k != 'hf_token'}
+        key_options['real_diarization'] = bool(options.get('hf_token')) and bool(options.get('enable_diarization'))
+        cache_key = json.dumps(key_options, sort_keys=True).encode()
+        cache_dir = os.path.join(self.temp_dir, "transcriptions")
+        
+        results = [None] * len(audios)
+        misses = []
+        for i, audio in enumerate(audios):
+            digest = hashlib.sha1(memoryview(audio))
+            digest.update(cache_key)
+            cache_path = os.path.join(cache_dir, f"{digest.hexdigest()}.json")
+            # Open directly rather than checking first, since another process may prune it
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    results[i] = json.load(f)
+                logger.info("Using cached transcription %s", cache_path)
+                # Mark it recently used so pruning drops older entries first
+                os.utime(cache_path)
+            except FileNotFoundError:
+                if results[i] is None:
+                    misses.append((i, cache_path))
+        
+        if not misses:
+            return results
+        
+        transcribed = word_transcribe_batch(
+            [audios[i] for i, _ in misses], release_models=self.release_models, **options
+        )
+        
+        for (i, cache_path), result in zip(misses, transcribed):
+            results[i] = result
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(result, f)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("Could not cache transcription: %s", e)
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+        
+        self._prune_transcription_cache(cache_dir)
+        return results
+    
+    def _prune_transcription_cache(self, cache_dir: str):
+        """Remove the least recently used cached transcriptions beyond transcription_cache_size."""
+        try:
+            with os.scandir(cache_dir) as entries:
+                cached = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith(".json")]
+        except FileNotFoundError:
+            return
+        cached.sort(reverse=True)
+        for _, path in cached[self.transcription_cache_size:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Another process pruned it first
+    
     def _parse_subtitle_config(self, config_dict: Dict) -> SubtitleConfig:
         """
         Parse subtitle configuration from dictionary format.
@@ -176,7 +700,35 @@ class VisubAPI:
                 }
             ]
         }
+        
+        Parsed configurations are cached by their canonical JSON form; each
+        call gets its own copy of the config and of every style in it, so
+        callers may modify them in place.
         """
+        try:
+            config_json = json.dumps(config_dict, sort_keys=True)
+        except (TypeError, ValueError):
+            # Not JSON-serializable, so it can't be a cache key
+            return self._build_subtitle_config(config_dict)
+        
+        cached = self._parse_subtitle_config_json(config_json)
+        # Copy the styles too, keeping the default shared with a speaker when it was
+        styles = {id(style): dataclasses.replace(style) for style in (cached.default_style, *cached.speaker_styles.values())}
+        return dataclasses.replace(
+            cached,
+            speaker_styles={speaker_id: styles[id(style)] for speaker_id, style in cached.speaker_styles.items()},
+            default_style=styles[id(cached.default_style)]
+        )
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _parse_subtitle_config_json(config_json: str) -> SubtitleConfig:
+        """Cached parse of a configuration serialized with sorted keys."""
+        return VisubAPI._build_subtitle_config(json.loads(config_json))
+    
+    @staticmethod
+    def _build_subtitle_config(config_dict: Dict) -> SubtitleConfig:
+        """Build a SubtitleConfig from the dictionary format of _parse_subtitle_config."""
         config = SubtitleConfig()
         
         max_words_value = config_dict.get('max_words', 4)
@@ -185,250 +737,102 @@ class VisubAPI:
         config.output_srt = config_dict.get('output_srt', False)
         config.enable_speaker_detection = config_dict.get('enable_speaker_detection', False)
         config.enable_word_highlighting = config_dict.get('enable_word_highlighting', True)
+        config.karaoke_tags = config_dict.get('karaoke_tags', False)
         
         # Parse speaker configurations
         speakers = config_dict.get('speakers', [])
         if speakers:
-            print(f"DEBUG: Parsing {len(speakers)} custom speaker configurations")
+            logger.debug("Parsing %s custom speaker configurations", len(speakers))
             for speaker_config in speakers:
                 speaker_id = speaker_config.get('speaker_id', 'default')
                 
-                # Convert frontend format to backend format with safer enum handling
-                def safe_font_family(font_name):
-                    font_map = {
-                        'Impact': FontFamily.IMPACT,
-                        'Arial Black': FontFamily.ARIAL_BLACK,
-                        'Bebas Neue': FontFamily.BEBAS_NEUE,
-                        'Montserrat Black': FontFamily.MONTSERRAT_BLACK,
-                        'Oswald': FontFamily.OSWALD,
-                        'Roboto Black': FontFamily.ROBOTO_BLACK,
-                        'Anton': FontFamily.ANTON,
-                        'Barlow': FontFamily.BARLOW,
-                        'Lato Black': FontFamily.LATO_BLACK,
-                        'Open Sans': FontFamily.OPEN_SANS_BOLD,
-                        'Nunito Black': FontFamily.NUNITO_BLACK,
-                        'Arial': FontFamily.ARIAL,
-                        'Helvetica': FontFamily.HELVETICA
-                    }
-                    return font_map.get(font_name, FontFamily.IMPACT)
+                # Only the settings the caller gave override the base style
+                overrides = {key: value for key, value in speaker_config.items() if key in _SPEAKER_STYLE_FIELDS}
+                for key, (lookup, fallback) in _ENUM_FIELDS.items():
+                    if key in overrides:
+                        overrides[key] = lookup.get(overrides[key], fallback)
+                for key in _COLOR_FIELDS:
+                    if key in overrides:
+                        overrides[key] = hex_to_ass_color(overrides[key])
                 
-                def safe_position(pos_name):
-                    pos_map = {
-                        'bottom_left': SubtitlePosition.BOTTOM_LEFT,
-                        'bottom_center': SubtitlePosition.BOTTOM_CENTER,
-                        'bottom_right': SubtitlePosition.BOTTOM_RIGHT,
-                        'middle_left': SubtitlePosition.MIDDLE_LEFT,
-                        'middle_center': SubtitlePosition.MIDDLE_CENTER,
-                        'middle_right': SubtitlePosition.MIDDLE_RIGHT,
-                        'top_left': SubtitlePosition.TOP_LEFT,
-                        'top_center': SubtitlePosition.TOP_CENTER,
-                        'top_right': SubtitlePosition.TOP_RIGHT
-                    }
-                    return pos_map.get(pos_name, SubtitlePosition.BOTTOM_CENTER)
-                
-                def safe_text_effect(effect_name):
-                    effect_map = {
-                        'none': TextEffect.NONE,
-                        'glow': TextEffect.GLOW,
-                        'shadow': TextEffect.SHADOW,
-                        'outline': TextEffect.OUTLINE,
-                        'outline_glow': TextEffect.OUTLINE_GLOW,
-                        'double_outline': TextEffect.DOUBLE_OUTLINE,
-                        'drop_shadow': TextEffect.DROP_SHADOW
-                    }
-                    return effect_map.get(effect_name, TextEffect.OUTLINE)
-                
-                def safe_animation(anim_name):
-                    anim_map = {
-                        'none': AnimationStyle.NONE,
-                        'fade_in': AnimationStyle.FADE_IN,
-                        'slide_up': AnimationStyle.SLIDE_UP,
-                        'scale_in': AnimationStyle.SCALE_IN,
-                        'type_writer': AnimationStyle.TYPE_WRITER,
-                        'bounce': AnimationStyle.BOUNCE,
-                        'pulse': AnimationStyle.PULSE
-                    }
-                    return anim_map.get(anim_name, AnimationStyle.NONE)
-                
-                style = SpeakerStyle(
-                    font_family=safe_font_family(speaker_config.get('font_family', 'Impact')),
-                    font_size=speaker_config.get('font_size', 48),
-                    font_weight=speaker_config.get('font_weight', 'bold'),
-                    primary_color=hex_to_ass_color(speaker_config.get('primary_color', '&H00FFFFFF')),
-                    outline_color=hex_to_ass_color(speaker_config.get('outline_color', '&H00000000')),
-                    shadow_color=hex_to_ass_color(speaker_config.get('shadow_color', '&H80000000')),
-                    background_color=hex_to_ass_color(speaker_config.get('background_color', '&H00000000')),
-                    position=safe_position(speaker_config.get('position', 'bottom_center')),
-                    margin_left=speaker_config.get('margin_left', 20),
-                    margin_right=speaker_config.get('margin_right', 20),
-                    margin_vertical=speaker_config.get('margin_vertical', 40),
-                    bold=speaker_config.get('bold', True),
-                    italic=speaker_config.get('italic', False),
-                    underline=speaker_config.get('underline', False),
-                    strikeout=speaker_config.get('strikeout', False),
-                    outline_width=speaker_config.get('outline_width', 3.0),
-                    shadow_distance=speaker_config.get('shadow_distance', 2.0),
-                    text_effect=safe_text_effect(speaker_config.get('text_effect', 'outline')),
-                    letter_spacing=speaker_config.get('letter_spacing', 0.0),
-                    line_spacing=speaker_config.get('line_spacing', 1.0),
-                    scale_x=speaker_config.get('scale_x', 100.0),
-                    scale_y=speaker_config.get('scale_y', 100.0),
-                    rotation=speaker_config.get('rotation', 0.0),
-                    animation=safe_animation(speaker_config.get('animation', 'none')),
-                    fade_in_duration=speaker_config.get('fade_in_duration', 0.0),
-                    fade_out_duration=speaker_config.get('fade_out_duration', 0.0),
-                    background_box=speaker_config.get('background_box', False),
-                    box_padding=speaker_config.get('box_padding', 10),
-                    box_opacity=speaker_config.get('box_opacity', 0.8),
-                    border_style=speaker_config.get('border_style', 1),
-                    all_caps=speaker_config.get('all_caps', True),
-                    word_wrap=speaker_config.get('word_wrap', True),
-                    max_line_length=speaker_config.get('max_line_length', 30),
-                    enable_word_highlighting=speaker_config.get('enable_word_highlighting', True),
-                    highlight_color=hex_to_ass_color(speaker_config.get('highlight_color', '&H0000FFFF')),
-                    highlight_outline_color=hex_to_ass_color(speaker_config.get('highlight_outline_color', '&H00000000')),
-                    highlight_bold=speaker_config.get('highlight_bold', True)
-                )
+                style = dataclasses.replace(_DEFAULT_SPEAKER_STYLE, **overrides)
                 
                 config.add_speaker_style(speaker_id, style)
-                print(f"DEBUG: Added custom style for {speaker_id}: {style.font_family.value}, {style.primary_color}")
+                logger.debug("Added custom style for %s: %s, %s", speaker_id, style.font_family.value, style.primary_color)
             
             # If speaker detection is disabled but custom styles exist, use first custom style as default
             if not config.enable_speaker_detection and config.speaker_styles:
-                first_speaker_id = list(config.speaker_styles.keys())[0]
+                first_speaker_id = next(iter(config.speaker_styles))
                 first_style = config.speaker_styles[first_speaker_id]
                 config.default_style = first_style
-                print(f"DEBUG: Speaker detection disabled, using custom style {first_speaker_id} as default")
+                logger.debug("Speaker detection disabled, using custom style %s as default", first_speaker_id)
             elif config.enable_speaker_detection and config.speaker_styles:
-                print(f"DEBUG: Speaker detection enabled with custom styles, keeping default style unchanged for fallback")
+                logger.debug("Speaker detection enabled with custom styles, keeping default style unchanged for fallback")
         else:
-            print("DEBUG: No custom speaker styles provided")
+            logger.debug("No custom speaker styles provided")
         
         return config
     
+    # The metadata getters below return constant data as fresh copies of the
+    # module-level tables, so callers may modify what they get back.
     def get_supported_models(self) -> List[str]:
         """Get list of supported WhisperX models."""
-        return [
-            "tiny", "tiny.en", "base", "base.en", "small", "small.en",
-            "medium", "medium.en", "large-v1", "large-v2", "large-v3",
-            "large", "distil-large-v2", "distil-medium.en", "distil-small.en",
-            "distil-large-v3", "large-v3-turbo", "turbo"
-        ]
+        return list(_SUPPORTED_MODELS)
     
     def get_supported_languages(self) -> List[str]:
         """Get list of supported languages for transcription."""
-        return [
-            "auto", "af", "am", "ar", "as", "az", "ba", "be", "bg", "bn", "bo", 
-            "br", "bs", "ca", "cs", "cy", "da", "de", "el", "en", "es", "et", 
-            "eu", "fa", "fi", "fo", "fr", "gl", "gu", "ha", "haw", "he", "hi", 
-            "hr", "ht", "hu", "hy", "id", "is", "it", "ja", "jw", "ka", "kk", 
-            "km", "kn", "ko", "la", "lb", "ln", "lo", "lt", "lv", "mg", "mi", 
-            "mk", "ml", "mn", "mr", "ms", "mt", "my", "ne", "nl", "nn", "no", 
-            "oc", "pa", "pl", "ps", "pt", "ro", "ru", "sa", "sd", "si", "sk", 
-            "sl", "sn", "so", "sq", "sr", "su", "sv", "sw", "ta", "te", "tg", 
-            "th", "tk", "tl", "tr", "tt", "uk", "ur", "uz", "vi", "yi", "yo", "zh"
-        ]
+        return list(LANGUAGES)
     
     def get_supported_positions(self) -> List[Dict]:
         """Get list of supported subtitle positions."""
-        return [
-            {"value": "bottom_left", "label": "Bottom Left"},
-            {"value": "bottom_center", "label": "Bottom Center"},
-            {"value": "bottom_right", "label": "Bottom Right"},
-            {"value": "middle_left", "label": "Middle Left"},
-            {"value": "middle_center", "label": "Middle Center"},
-            {"value": "middle_right", "label": "Middle Right"},
-            {"value": "top_left", "label": "Top Left"},
-            {"value": "top_center", "label": "Top Center"},
-            {"value": "top_right", "label": "Top Right"}
-        ]
+        return [{"value": value, "label": label} for value, label in _POSITIONS]
     
     def get_viral_fonts(self) -> List[Dict]:
         """Get list of fonts popular for viral video content."""
-        return [
-            {"value": font.name.lower(), "label": font.value, "category": "viral"}
-            for font in FontFamily
-        ]
+        return [{"value": value, "label": label, "category": "viral"} for value, label in _FONT_OPTIONS]
     
     def get_text_effects(self) -> List[Dict]:
         """Get list of available text effects."""
-        return [
-            {"value": effect.value, "label": effect.value.replace("_", " ").title()}
-            for effect in TextEffect
-        ]
+        return [{"value": value, "label": label} for value, label in _TEXT_EFFECT_OPTIONS]
     
     def get_animation_styles(self) -> List[Dict]:
         """Get list of available animation styles."""
-        return [
-            {"value": anim.value, "label": anim.value.replace("_", " ").title()}
-            for anim in AnimationStyle
-        ]
+        return [{"value": value, "label": label} for value, label in _ANIMATION_OPTIONS]
     
     def get_preset_styles(self) -> Dict[str, Dict]:
         """Get preset styling configurations for viral content."""
-        presets = create_viral_preset_styles()
-        result = {}
-        
-        for name, style in presets.items():
-            result[name] = {
+        return {
+            name: {
                 "name": name.replace("_", " ").title(),
                 "description": self._get_preset_description(name),
-                "preview": {
-                    "font_family": style.font_family.value,
-                    "font_size": style.font_size,
-                    "primary_color": style.primary_color,
-                    "outline_color": style.outline_color,
-                    "text_effect": style.text_effect.value,
-                    "all_caps": style.all_caps,
-                    "bold": style.bold
-                }
+                "preview": dict(preview)
             }
-        
-        return result
+            for name, preview in _PRESET_PREVIEWS
+        }
     
     def get_color_palette(self) -> List[Dict]:
         """Get popular colors for viral video content."""
-        colors = get_viral_color_palette()
-        color_names = [
-            "White", "Yellow", "Green", "Blue", "Magenta", 
-            "Lime", "Pink", "Orange", "Purple", "Cyan"
-        ]
-        
         return [
             {"value": color, "label": name, "hex": self._ass_to_hex(color)}
-            for color, name in zip(colors, color_names)
+            for color, name in _COLOR_OPTIONS
         ]
     
     def _get_preset_description(self, preset_name: str) -> str:
         """Get description for preset styles."""
-        descriptions = {
-            "tiktok_classic": "Bold Impact font with black outline - perfect for TikTok",
-            "youtube_viral": "Eye-catching yellow text for maximum attention",
-            "instagram_reel": "Modern style with trendy glow effect",
-            "podcast_clean": "Clean, readable style for long-form content",
-            "gaming_streamer": "High-energy style popular with gamers",
-            "minimalist": "Simple, elegant styling for sophisticated content",
-            "news_documentary": "Professional style with background box",
-            "retro_vintage": "Stylized retro look with unique flair"
-        }
-        return descriptions.get(preset_name, "Custom styling preset")
+        return _PRESET_DESCRIPTIONS.get(preset_name, "Custom styling preset")
     
-    def _ass_to_hex(self, ass_color: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _ass_to_hex(ass_color: str) -> str:
         """Convert ASS color format to hex for frontend display."""
-        if ass_color.startswith("&H"):
-            # Extract BGR values from format &H00BBGGRR
-            hex_part = ass_color[2:]  # Remove &H
-            if len(hex_part) >= 8:
-                # Skip alpha (first 2 chars) and get BGR values
-                alpha = hex_part[0:2]
-                b = hex_part[2:4]
-                g = hex_part[4:6] 
-                r = hex_part[6:8]
-                return f"#{r}{g}{b}".upper()
-            elif len(hex_part) >= 6:
-                # Handle format without alpha
-                b, g, r = hex_part[0:2], hex_part[2:4], hex_part[4:6]
-                return f"#{r}{g}{b}".upper()
+        if ass_color.startswith("&H") and len(ass_color) >= 8:
+            # &H00BBGGRR or &HBBGGRR - the low 24 bits are BGR, alpha is dropped
+            digits = ass_color[2:10] if len(ass_color) >= 10 else ass_color[2:8]
+            try:
+                bgr = int(digits, 16) & 0xFFFFFF
+            except ValueError:
+                return "#FFFFFF"
+            return f"#{bgr & 0xFF:02X}{(bgr >> 8) & 0xFF:02X}{bgr >> 16:02X}"
         return "#FFFFFF"  # Default to white
     
     def validate_config(self, config_dict: Dict) -> Dict:
@@ -453,14 +857,23 @@ class VisubAPI:
         if not isinstance(speakers, list):
             errors.append("speakers must be a list")
         else:
+            # Check for duplicate speaker IDs in the same pass, reporting the first one
+            seen_ids = set()
+            has_duplicates = False
+            duplicate_id = None
             for i, speaker in enumerate(speakers):
                 speaker_errors = self._validate_speaker_config(speaker, i)
                 errors.extend(speaker_errors)
-        
-        # Check for duplicate speaker IDs
-        speaker_ids = [s.get('speaker_id') for s in speakers if isinstance(s, dict)]
-        if len(speaker_ids) != len(set(speaker_ids)):
-            errors.append("Duplicate speaker IDs found")
+                
+                if not has_duplicates and isinstance(speaker, dict):
+                    speaker_id = speaker.get('speaker_id')
+                    if speaker_id in seen_ids:
+                        has_duplicates = True
+                        duplicate_id = speaker_id
+                    seen_ids.add(speaker_id)
+            
+            if has_duplicates:
+                errors.append(f"Duplicate speaker IDs found: {duplicate_id}")
         
         return {
             'valid': len(errors) == 0,
@@ -488,24 +901,19 @@ class VisubAPI:
         
         # Validate color format
         color = speaker.get('color', '#FFFFFF')
-        if isinstance(color, str):
-            if color.startswith('#') and len(color) == 7:
-                try:
-                    int(color[1:], 16)  # Validate hex
-                except ValueError:
-                    errors.append(f"{prefix}Invalid hex color format")
-            elif not color.startswith('&H'):
-                errors.append(f"{prefix}Color must be hex (#RRGGBB) or ASS format (&H00BBGGRR)")
+        if isinstance(color, str) and not COLOR_RE.match(color):
+            errors.append(f"{prefix}Color must be hex (#RRGGBB) or ASS format (&H00BBGGRR)")
         
         # Validate position
         position = speaker.get('position', 'bottom_center')
-        valid_positions = [pos['value'] for pos in self.get_supported_positions()]
-        if position not in valid_positions:
-            errors.append(f"{prefix}Invalid position. Must be one of: {valid_positions}")
+        if position not in _VALID_POSITIONS:
+            errors.append(f"{prefix}Invalid position. Must be one of: {[value for value, _ in _POSITIONS]}")
         
         return errors
 
 
-def create_api_instance(temp_dir: Optional[str] = None) -> VisubAPI:
+def create_api_instance(
+    temp_dir: Optional[str] = None, transcription_cache_size: int = 256, release_models: bool = True
+) -> VisubAPI:
     """Factory function to create a Visub API instance."""
-    return VisubAPI(temp_dir)
\ No newline at end of file
+    return VisubAPI(temp_dir, transcription_cache_size, release_models)
\ No newline at end of file
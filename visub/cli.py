@@ -1,20 +1,66 @@
 import os
 import ffmpeg
+import functools
+import itertools
+import logging
 import argparse
 import warnings
-import tempfile
-from .utils import filename, str2bool, ass_time, format_timedelta
-from .transcribe import word_transcribe
+import numpy as np
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from .utils import DEFAULT_COMPUTE_TYPES, LANGUAGES, VIDEO_ENCODER_OPTIONS, detect_video_encoder, mp4_audio_codec, filename, str2bool, ass_time, format_timedelta
+from .transcribe import word_transcribe_batch
 from .config import SubtitleConfig, create_default_config
 from datetime import timedelta
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Dialogue event fields up to the text; tags and text are buffered as separate
+# parts so the (long) line text isn't copied again into a per-line string
+_DIALOGUE_HEAD = "Dialogue: 0,{},{},{},,0,0,0,,"
+
+# Header with no animations/transitions; the style lines and _ASS_EVENTS_HEADER follow it
+_ASS_HEADER = """[Script Info]
+Title: Word-by-Word Subtitles
+ScriptType: v4.00+
+WrapStyle: 0
+ScaledBorderAndShadow: yes
+PlayResX: 1280
+PlayResY: 720
+YCbCr Matrix: None
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+"""
+
+_ASS_EVENTS_HEADER = "\n[Events]\nFormat: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+
+_LANGUAGE_SET = frozenset(LANGUAGES)
+
+# WhisperX batch sizes when --batch_size isn't given; CPU inference gains little
+# from wide batches and they cost memory
+_DEFAULT_BATCH_SIZES = {"cuda": 16, "cpu": 8}
+
+# Punctuation that closes a sentence in full sentence mode
+_SENTENCE_ENDINGS = frozenset('.!?:;')
 
 def get_animation_tags(animation_type, style):
     """Generate ASS animation tags based on animation type and style settings."""
+    return _animation_tags(
+        animation_type,
+        getattr(style, 'fade_in_duration', 0.0),
+        getattr(style, 'fade_out_duration', 0.0)
+    )
+
+@functools.lru_cache(maxsize=256)
+def _animation_tags(animation_type, fade_in, fade_out):
+    """Build the tags for get_animation_tags; cached since styles repeat on every line."""
     if animation_type == 'none':
         return ""
     
-    fade_in_duration = getattr(style, 'fade_in_duration', 0.0) * 1000  # Convert to milliseconds
-    fade_out_duration = getattr(style, 'fade_out_duration', 0.0) * 1000
+    fade_in_duration = fade_in * 1000  # Convert to milliseconds
+    fade_out_duration = fade_out * 1000
     
     # Only apply animations if fade durations are greater than 0
     if fade_in_duration == 0 and fade_out_duration == 0:
@@ -48,6 +94,63 @@ def get_animation_tags(animation_type, style):
     # Default fallback - only apply if durations are > 0
     return ""
 
+@functools.lru_cache(maxsize=64)
+def _highlight_tags(default_color, highlight_color, highlight_bold):
+    """
+    Return the (start, end) ASS override tags wrapped around a highlighted word.
+    
+    The end tags restore default_color, the style's primary color used for
+    non-highlighted words.
+    """
+    start_tags = ""
+    end_tags = ""
+    
+    # Add bold formatting if enabled
+    if highlight_bold:
+        start_tags += "{\\b1}"
+        end_tags = "{\\b0}" + end_tags
+    
+    # Add color formatting
+    start_tags += f"{{\\c{highlight_color}}}"
+    end_tags = f"{{\\c{default_color}}}" + end_tags
+    
+    return start_tags, end_tags
+
+class _StylePlan(NamedTuple):
+    """Per-style text handling for get_subtitles, resolved once per style."""
+    all_caps: bool
+    highlight: bool
+    animation_tags: str
+    highlight_color: str
+    highlight_start_tags: str
+    highlight_end_tags: str
+
+def _style_plan(style, config):
+    """Resolve the attribute checks get_subtitles would otherwise make per subtitle and per word."""
+    animation_tags = ""
+    if hasattr(style, 'animation') and style.animation != 'none':
+        animation_tags = get_animation_tags(style.animation, style)
+    
+    highlight_color = getattr(style, 'highlight_color', '&H0000FFFF')
+    highlight_start_tags, highlight_end_tags = _highlight_tags(
+        style.primary_color, highlight_color, getattr(style, 'highlight_bold', True)
+    )
+    
+    return _StylePlan(
+        all_caps=bool(getattr(style, 'all_caps', False)),
+        highlight=bool(config.enable_word_highlighting and getattr(style, 'enable_word_highlighting', False)),
+        animation_tags=animation_tags,
+        highlight_color=highlight_color,
+        highlight_start_tags=highlight_start_tags,
+        highlight_end_tags=highlight_end_tags
+    )
+
+def _language(value):
+    """argparse type for --language: O(1) membership instead of a choices scan."""
+    if value not in _LANGUAGE_SET:
+        raise argparse.ArgumentTypeError(f"invalid language: {value!r}")
+    return value
+
 def main():
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
@@ -63,7 +166,16 @@ def main():
                         help="whether to output the .srt file along with the video files")
     parser.add_argument("--srt_only", type=str2bool, default=False,
                         help="only generate the .srt file and not create overlayed video")
-    parser.add_argument("--language", type=str, default="auto", choices=["auto","af","am","ar","as","az","ba","be","bg","bn","bo","br","bs","ca","cs","cy","da","de","el","en","es","et","eu","fa","fi","fo","fr","gl","gu","ha","haw","he","hi","hr","ht","hu","hy","id","is","it","ja","jw","ka","kk","km","kn","ko","la","lb","ln","lo","lt","lv","mg","mi","mk","ml","mn","mr","ms","mt","my","ne","nl","nn","no","oc","pa","pl","ps","pt","ro","ru","sa","sd","si","sk","sl","sn","so","sq","sr","su","sv","sw","ta","te","tg","th","tk","tl","tr","tt","uk","ur","uz","vi","yi","yo","zh"], 
+    parser.add_argument("--encoder", type=str, default="auto", choices=["auto", *VIDEO_ENCODER_OPTIONS],
+                        help="video encoder for the burn-in; auto picks a hardware H.264 encoder when one works")
+    parser.add_argument("--device", type=str, default="auto", choices=["auto", "cuda", "cpu"],
+                        help="device to transcribe on; auto uses CUDA when it is available")
+    parser.add_argument("--batch_size", type=int, default=None,
+                        help="WhisperX batch size; defaults to 16 on CUDA and 8 on CPU")
+    parser.add_argument("--compute_type", type=str, default=None,
+                        help="CTranslate2 compute type for the WhisperX model (e.g. float16, int8_float16, int8); "
+                             "defaults to VISUB_COMPUTE_TYPE, else float16 on CUDA and int8 on CPU")
+    parser.add_argument("--language", type=_language, default="auto",
     help="What is the origin language of the video? If unset, it is detected automatically.")
 
     args = parser.parse_args().__dict__
@@ -73,6 +185,14 @@ def main():
     srt_only: bool = args.pop("srt_only")
     language: str = args.pop("language")
     num_words: int = args.pop("num_words")
+    encoder: str = args.pop("encoder")
+
+    if args["device"] == "auto":
+        args["device"] = "cuda" if torch.cuda.is_available() else "cpu"
+    if args["batch_size"] is None:
+        args["batch_size"] = _DEFAULT_BATCH_SIZES[args["device"]]
+    if args["compute_type"] is None:
+        args["compute_type"] = os.getenv("VISUB_COMPUTE_TYPE") or DEFAULT_COMPUTE_TYPES[args["device"]]
     
     os.makedirs(output_dir, exist_ok=True)
 
@@ -91,62 +211,140 @@ def main():
     config.max_words_per_subtitle = num_words
     config.output_srt = output_srt or srt_only
     
+    # One WhisperX session for every video instead of reloading the model per file;
+    # the arrays stay alive in `audios`, so the results can be keyed by id().
+    # Nothing reuses the models afterwards, so free each one once its stage is done
+    audio_list = list(audios.values())
+    transcriptions = {
+        id(audio): result
+        for audio, result in zip(audio_list, word_transcribe_batch(audio_list, release_models=True, **args))
+    }
+
     subtitles = get_subtitles(
         audios, 
         output_dir, 
-        lambda audio_path: word_transcribe(audio_path, **args),
+        lambda audio: transcriptions[id(audio)],
         config
     )
 
     if srt_only:
         return
 
-    for path, ass_path in subtitles.items():
-        # Use MP4 as intermediate format (legal for processing, not distribution)
-        out_path = os.path.join(output_dir, f"{filename(path)}_subtitled.mp4")
+    if encoder == "auto":
+        encoder = detect_video_encoder()
+
+    # Videos are independent ffmpeg subprocesses, so burn them in concurrently
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(len(subtitles), cpu_count))
+    # Split the cores between concurrent encodes instead of each one claiming all of them
+    threads = cpu_count // workers if workers > 1 else 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_burn_subtitles, path, ass_path, output_dir, encoder, threads, workers == 1)
+            for path, ass_path in subtitles.items()
+        ]
+        for future in futures:
+            future.result()
 
-        print(f"Adding subtitles to {filename(path)}...")
 
-        video = ffmpeg.input(path)
-        audio = video.audio
+def subtitled_output(path, ass_path, target, encoder="libx264", **output_options):
+    """
+    Build the ffmpeg graph that burns ASS subtitles into a video.
+    
+    A single input node feeds both streams: the subtitle filter requires
+    reencoding the video with the given encoder, while the audio track is
+    stream-copied as-is when MP4 can hold its codec and reencoded to AAC
+    otherwise (e.g. Vorbis or PCM from .webm, .avi and .mkv uploads).
+    """
+    # Decode on the GPU too when encoding with NVENC
+    input_options = {'hwaccel': 'cuda'} if encoder.endswith('_nvenc') else {}
+    source = ffmpeg.input(path, **input_options)
+    
+    return ffmpeg.output(
+        source.video.filter('subtitles', ass_path),
+        source.audio,
+        target,
+        **{
+            'threads': 0,  # let the encoder pick its own thread count unless told otherwise
+            'c:v': encoder, **VIDEO_ENCODER_OPTIONS[encoder], 'c:a': mp4_audio_codec(path),
+            **output_options
+        }
+    )
+
 
-        # Apply subtitles - subtitle filter requires reencoding
-        # Preserve original format but must recompute video due to subtitle overlay
-        ffmpeg.concat(
-            video.filter('subtitles', ass_path), 
-            audio, 
-            v=1, 
-            a=1
-        ).output(out_path).run(quiet=False, overwrite_output=True)
+def _burn_subtitles(path, ass_path, output_dir, encoder, threads=0, show_progress=True):
+    """Render the ASS subtitles onto a video and return the output path."""
+    # Use MP4 as intermediate format (legal for processing, not distribution)
+    base_name = filename(path)
+    out_path = os.path.join(output_dir, f"{base_name}_subtitled.mp4")
 
-        print(f"Saved subtitled video to {os.path.abspath(out_path)}.")
+    print(f"Adding subtitles to {base_name}...")
+
+    stream = subtitled_output(
+        path, ass_path, out_path, encoder, threads=threads, movflags='+faststart'
+    )
+    if not show_progress:
+        # Concurrent encodes would interleave their progress lines, so only report errors
+        stream = stream.global_args("-nostats", "-loglevel", "error")
+    stream.run(quiet=False, overwrite_output=True)
+
+    print(f"Saved subtitled video to {os.path.abspath(out_path)}.")
+    return out_path
 
 
 def get_audio(paths):
-    temp_dir = tempfile.gettempdir()
+    """
+    Decode the audio track of each video into memory for transcription.
+    
+    Audio is decoded once, straight from the video, to the 16 kHz mono
+    float32 array WhisperX consumes, instead of round-tripping through a
+    temporary WAV file that WhisperX would decode again.
+    
+    Returns:
+        Dict of {path: audio}
+    """
+    # Each decode is an ffmpeg subprocess, so threads run them concurrently
+    workers = max(1, min(len(paths), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(_decode_audio, path) for path in paths}
+        return {path: future.result() for path, future in futures.items()}
+
 
-    audio_paths = {}
+def _decode_audio(path):
+    """Decode one video's audio track to a 16 kHz mono float32 array."""
+    print(f"Extracting audio from {filename(path)}...")
 
-    for path in paths:
-        print(f"Extracting audio from {filename(path)}...")
-        output_path = os.path.join(temp_dir, f"{filename(path)}.wav")
+    # Only errors go to the captured stderr, not a progress line every half second
+    out, _ = ffmpeg.input(path).output(
+        "pipe:", vn=None, format="s16le",
+        acodec="pcm_s16le", ac=1, ar="16k"
+    ).global_args("-nostats", "-loglevel", "error").run(capture_stdout=True, capture_stderr=True)
 
-        ffmpeg.input(path).output(
-            output_path,
-            acodec="pcm_s16le", ac=1, ar="16k"
-        ).run(quiet=True, overwrite_output=True)
+    # Same values as whisperx.load_audio, converted with one copy and scaled in place
+    audio = np.frombuffer(out, np.int16).astype(np.float32)
+    audio /= 32768.0
+    return audio
 
-        audio_paths[path] = output_path
 
-    return audio_paths
+def _subtitle_group(words):
+    """Build one subtitle entry from consecutive words, stripping each word's text once."""
+    word_texts = [word["word"].strip() for word in words]
+    return {
+        "start": words[0]["start"],
+        "end": words[-1]["end"],
+        "text": " ".join(word_texts),
+        "speaker": words[0].get("speaker", None),  # Speaker of the first word
+        "words": words,  # Preserve individual word data for highlighting
+        "word_texts": word_texts
+    }
 
 
-def get_subtitles(audio_paths: dict, output_dir: str, transcribe: callable, config: SubtitleConfig):
+def get_subtitles(audios: dict, output_dir: str, transcribe: callable, config: SubtitleConfig):
     """
     Generate word-by-word ASS subtitles with customizable styling per speaker.
     
     Args:
-        audio_paths: Dict of {path: audio_path}
+        audios: Dict of {path: audio} as returned by get_audio
         output_dir: Directory for ASS/SRT output
         transcribe: Callable returning transcription with word-level timestamps
         config: SubtitleConfig object containing all styling preferences
@@ -156,19 +354,26 @@ def get_subtitles(audio_paths: dict, output_dir: str, transcribe: callable, conf
     """
     subtitles_path = {}
 
-    for path, audio_path in audio_paths.items():
-        base_name = os.path.splitext(os.path.basename(path))[0]
+    # Everything up to the first Dialogue event only depends on the config,
+    # so it is built once and shared by every file
+    styles = config.get_all_styles_for_ass()
+    logger.debug("Writing %d styles to ASS files", len(styles))
+    for i, style in enumerate(styles):
+        logger.debug("Style %d: %s", i, style)
+    ass_prelude = "".join((_ASS_HEADER, *(style + "\n" for style in styles), _ASS_EVENTS_HEADER))
+
+    for path, audio in audios.items():
+        result = transcribe(audio)
+        base_name = filename(path)
         ass_path = os.path.join(output_dir, f"{base_name}.ass")
         srt_path = os.path.join(output_dir, f"{base_name}.srt") if config.output_srt else None
         
         print(f"Generating subtitles for {base_name}...")
-        print(f"DEBUG: Config max_words_per_subtitle: {config.max_words_per_subtitle}")
-        print(f"DEBUG: Config speaker_styles: {list(config.speaker_styles.keys())}")
-        print(f"DEBUG: Config enable_speaker_detection: {config.enable_speaker_detection}")
-        print(f"DEBUG: Config enable_word_highlighting: {config.enable_word_highlighting}")
-
-        # Transcribe audio (assumes word-level timestamps)
-        result = transcribe(audio_path)
+        logger.debug("Config max_words_per_subtitle: %s", config.max_words_per_subtitle)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Config speaker_styles: %s", list(config.speaker_styles.keys()))
+        logger.debug("Config enable_speaker_detection: %s", config.enable_speaker_detection)
+        logger.debug("Config enable_word_highlighting: %s", config.enable_word_highlighting)
 
         # Extract and group words into subtitles
         subtitle_groups = []
@@ -185,216 +390,134 @@ def get_subtitles(audio_paths: dict, output_dir: str, transcribe: callable, conf
                     for word in words_in_segment:
                         current_sentence.append(word)
                         
-                        # Check if this word ends a sentence
-                        word_text = word["word"].strip()
-                        if word_text.endswith(('.', '!', '?', ':', ';')) or len(current_sentence) >= 50:  # Max 50 words per sentence as safety
+                        # Check if this word ends a sentence; only strip when there's trailing whitespace
+                        last_char = word["word"][-1:]
+                        if last_char.isspace():
+                            last_char = word["word"].rstrip()[-1:]
+                        if last_char in _SENTENCE_ENDINGS or len(current_sentence) >= 50:  # Max 50 words per sentence as safety
                             if current_sentence:
-                                # Get speaker information from first word in sentence
-                                speaker_id = current_sentence[0].get("speaker", None)
-                                
-                                # Combine text from all words in sentence
-                                combined_text = " ".join(w["word"] for w in current_sentence)
-                                
-                                subtitle_groups.append({
-                                    "start": current_sentence[0]["start"],
-                                    "end": current_sentence[-1]["end"],
-                                    "text": combined_text,
-                                    "speaker": speaker_id,
-                                    "words": current_sentence  # Preserve individual word data for highlighting
-                                })
+                                subtitle_groups.append(_subtitle_group(current_sentence))
                                 current_sentence = []
                     
                     # Handle any remaining words in incomplete sentence
                     if current_sentence:
-                        speaker_id = current_sentence[0].get("speaker", None)
-                        combined_text = " ".join(w["word"] for w in current_sentence)
-                        
-                        subtitle_groups.append({
-                            "start": current_sentence[0]["start"],
-                            "end": current_sentence[-1]["end"],
-                            "text": combined_text,
-                            "speaker": speaker_id,
-                            "words": current_sentence
-                        })
+                        subtitle_groups.append(_subtitle_group(current_sentence))
                 else:
                     # Group words into chunks of max_words_per_subtitle
-                    for i in range(0, len(words_in_segment), config.max_words_per_subtitle):
-                        word_group = words_in_segment[i:i + config.max_words_per_subtitle]
-                        
-                        if word_group:  # Make sure group is not empty
-                            # Get speaker information from first word in group
-                            speaker_id = word_group[0].get("speaker", None)
-                            
-                            # Combine text from all words in group
-                            combined_text = " ".join(word["word"] for word in word_group)
-                            
-                            subtitle_groups.append({
-                                "start": word_group[0]["start"],
-                                "end": word_group[-1]["end"],
-                                "text": combined_text,
-                                "speaker": speaker_id,
-                                "words": word_group  # Preserve individual word data for highlighting
-                            })
-
-        # Write ASS file with multiple styles
-        with open(ass_path, "w", encoding="utf-8") as f:
-            # Write ASS header with no animations/transitions
-            f.write("""[Script Info]
-Title: Word-by-Word Subtitles
-ScriptType: v4.00+
-WrapStyle: 0
-ScaledBorderAndShadow: yes
-PlayResX: 1280
-PlayResY: 720
-YCbCr Matrix: None
+                    remaining_words = iter(words_in_segment)
+                    while word_group := list(itertools.islice(remaining_words, config.max_words_per_subtitle)):
+                        subtitle_groups.append(_subtitle_group(word_group))
 
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-""")
+        # Build the ASS file with multiple styles in memory and write it once
+        parts = [ass_prelude]
+        
+        # Resolve each speaker's style, and what it does to the text, once per file rather than per subtitle
+        default_resolution = ("Default", config.default_style, _style_plan(config.default_style, config))
+        speaker_resolutions = {
+            speaker_id: (f"Speaker_{speaker_id}", style, _style_plan(style, config))
+            for speaker_id, style in config.speaker_styles.items()
+            if speaker_id
+        }
+        first_resolution = default_resolution
+        first_speaker_id = next(iter(config.speaker_styles), None)
+        if first_speaker_id is not None:
+            first_style = config.speaker_styles[first_speaker_id]
+            first_resolution = (f"Speaker_{first_speaker_id}", first_style, _style_plan(first_style, config))
+        # Speakers without a custom style fall back to the first custom style
+        # only when speaker detection is off
+        unmatched_resolution = default_resolution if config.enable_speaker_detection else first_resolution
+        
+        # Write dialogue events with appropriate styles and word highlighting
+        for i, subtitle in enumerate(subtitle_groups):
+            start_time = ass_time(subtitle["start"])
+            end_time = ass_time(subtitle["end"])
+            text = subtitle["text"].replace('\n', '\\N')
             
-            # Write all style definitions
-            styles = config.get_all_styles_for_ass()
-            print(f"DEBUG: Writing {len(styles)} styles to ASS file")
-            for i, style in enumerate(styles):
-                print(f"DEBUG: Style {i}: {style}")
-                f.write(style + "\n")
+            # Determine style name and get the actual style object for text transformations
+            speaker = subtitle["speaker"]
+            if speaker in speaker_resolutions:
+                # Speaker detected and has custom style
+                style_name, current_style, plan = speaker_resolutions[speaker]
+            elif speaker is None:
+                # No speaker for this subtitle - use first custom style, if any
+                style_name, current_style, plan = first_resolution
+            else:
+                style_name, current_style, plan = unmatched_resolution
             
-            f.write("\n[Events]\n")
-            f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
+            # Apply text transformations based on style settings
+            if plan.all_caps:
+                text = text.upper()
             
-            # Write dialogue events with appropriate styles and word highlighting
-            for i, subtitle in enumerate(subtitle_groups):
-                start_time = ass_time(subtitle["start"])
-                end_time = ass_time(subtitle["end"])
-                text = subtitle["text"].replace('\n', '\\N')
+            # Add word highlighting if enabled (karaoke-style)
+            if plan.highlight and "words" in subtitle:
                 
-                # Determine style name and get the actual style object for text transformations
-                style_name = "Default"
-                current_style = config.default_style
+                # Create karaoke-style highlighting using exact WhisperX word timings
+                words = subtitle["words"]
                 
-                if subtitle["speaker"] and subtitle["speaker"] in config.speaker_styles:
-                    # Speaker detected and has custom style
-                    style_name = f"Speaker_{subtitle['speaker']}"
-                    current_style = config.speaker_styles[subtitle["speaker"]]
-                    print(f"DEBUG: Using custom style for detected speaker {subtitle['speaker']}: {style_name}")
-                elif config.speaker_styles and not config.enable_speaker_detection:
-                    # No speaker detection but custom styles exist - use first custom style
-                    first_speaker_id = list(config.speaker_styles.keys())[0]
-                    style_name = f"Speaker_{first_speaker_id}"
-                    current_style = config.speaker_styles[first_speaker_id]
-                    print(f"DEBUG: No speaker detection, using first custom style: {style_name}")
-                elif config.speaker_styles and subtitle["speaker"] is None:
-                    # Speaker detection enabled but no speaker detected for this subtitle - use first custom style
-                    first_speaker_id = list(config.speaker_styles.keys())[0]
-                    style_name = f"Speaker_{first_speaker_id}"
-                    current_style = config.speaker_styles[first_speaker_id]
-                    print(f"DEBUG: Speaker detection enabled but no speaker for this subtitle, using first custom style: {style_name}")
+                # Apply text transformations to individual words first
+                if plan.all_caps:
+                    processed_words = [word_text.upper() for word_text in subtitle["word_texts"]]
                 else:
-                    print(f"DEBUG: Using default style for speaker {subtitle.get('speaker', 'None')}")
+                    processed_words = list(subtitle["word_texts"])
                 
-                # Apply text transformations based on style settings
-                if hasattr(current_style, 'all_caps') and current_style.all_caps:
-                    text = text.upper()
-                    print(f"DEBUG: Applied uppercase transformation to: {text}")
+                # Create seamless timing by forcing exact continuity: use exact WhisperX
+                # start times (rounded to 2 decimals) and end each word exactly when the
+                # next one starts; the last word keeps its own WhisperX end time
+                word_starts = [round(word_data["start"], 2) for word_data in words]
+                word_ends = word_starts[1:]
+                if words:
+                    word_ends.append(round(words[-1]["end"], 2))
                 
-                # Add word highlighting if enabled (karaoke-style)
-                if (config.enable_word_highlighting and 
-                    hasattr(current_style, 'enable_word_highlighting') and 
-                    current_style.enable_word_highlighting and
-                    "words" in subtitle):
-                    
-                    # Create karaoke-style highlighting using exact WhisperX word timings
-                    words = subtitle["words"]
-                    
-                    # Apply text transformations to individual words first
-                    processed_words = []
-                    for i, word_item in enumerate(words):
-                        word_text = word_item["word"].strip()
-                        if hasattr(current_style, 'all_caps') and current_style.all_caps:
-                            word_text = word_text.upper()
-                        processed_words.append((i, word_text))
-                    
-                    # Use the style's primary color for non-highlighted words
-                    default_color = current_style.primary_color
-                    
-                    # Create seamless timing by forcing exact continuity
-                    adjusted_timings = []
-                    
-                    # First pass: use exact WhisperX timings, only adjust for seamless continuity
-                    for word_index, word_data in enumerate(words):
-                        # Always use exact WhisperX start time for each word (rounded to 2 decimals)
-                        start_time = round(word_data["start"], 2)
-                        
-                        if word_index < len(words) - 1:
-                            # End exactly when next word starts (WhisperX timing)
-                            end_time = round(words[word_index + 1]["start"], 2)
-                        else:
-                            # Last word: use its exact WhisperX end time
-                            end_time = round(word_data["end"], 2)
-                        
-                        adjusted_timings.append({
-                            "start": start_time,
-                            "end": end_time,
-                            "word": word_data["word"],
-                            "original_start": word_data["start"],
-                            "original_end": word_data["end"]
-                        })
+                # Animation applied only to the first word for entrance effect, then word highlighting continues
+                animation_tags = plan.animation_tags
+                
+                if config.karaoke_tags:
+                    # Single line per subtitle: libass fills each word from the default to the
+                    # highlight color on its \k schedule. Sung words stay highlighted and
+                    # can't be bolded, but the file has one event per subtitle instead of per word
+                    karaoke_text = " ".join(
+                        f"{{\\k{max(0, round((word_end - word_start) * 100))}}}{word_text}"
+                        for word_start, word_end, word_text in zip(word_starts, word_ends, processed_words)
+                    )
+                    line_start = ass_time(word_starts[0])
+                    line_end = ass_time(word_ends[-1])
+                    parts.extend((
+                        _DIALOGUE_HEAD.format(line_start, line_end, style_name), animation_tags,
+                        f"{{\\1c{plan.highlight_color}\\2c{current_style.primary_color}}}", karaoke_text, "\n"
+                    ))
+                else:
+                    # Create subtitle lines with perfectly seamless timing
+                    for word_index, (word_start, word_end) in enumerate(zip(word_starts, word_ends)):
+                        word_start = ass_time(word_start)
+                        word_end = ass_time(word_end)
                     
-                    # Get animation tags for subtitle entrance effect
-                    animation_tags = ""
-                    if hasattr(current_style, 'animation') and current_style.animation != 'none':
-                        # Animation applied only to the first word for entrance effect, then word highlighting continues
-                        animation_tags = get_animation_tags(current_style.animation, current_style)
+                        # Create subtitle text showing full chunk with current word highlighted,
+                        # swapping only the current word's slot instead of rebuilding every word
+                        word_text = processed_words[word_index]
+                        processed_words[word_index] = f"{plan.highlight_start_tags}{word_text}{plan.highlight_end_tags}"
+                        highlighted_text = " ".join(processed_words)
+                        processed_words[word_index] = word_text
                     
-                    # Second pass: create subtitle lines with perfectly seamless timing
-                    for word_index, timing in enumerate(adjusted_timings):
-                        word_start = ass_time(timing["start"])
-                        word_end = ass_time(timing["end"])
-                        
-                        # Get highlight styling from current style configuration
-                        highlight_color = getattr(current_style, 'highlight_color', '&H0000FFFF')
-                        highlight_bold = getattr(current_style, 'highlight_bold', True)
-                        
-                        # Build the highlight formatting tags
-                        highlight_start_tags = ""
-                        highlight_end_tags = ""
-                        
-                        # Add bold formatting if enabled
-                        if highlight_bold:
-                            highlight_start_tags += "{\\b1}"
-                            highlight_end_tags = "{\\b0}" + highlight_end_tags
-                        
-                        # Add color formatting
-                        highlight_start_tags += f"{{\\c{highlight_color}}}"
-                        highlight_end_tags = f"{{\\c{default_color}}}" + highlight_end_tags
-                        
-                        
-                        # Create subtitle text showing full chunk with current word highlighted
-                        highlighted_text = " ".join(
-                            f"{highlight_start_tags}{word_text}{highlight_end_tags}" if i == word_index else word_text
-                            for i, word_text in processed_words
-                        )
-                        
                         # Write subtitle line for this word with forced seamless timing (add animation only to first word)
                         final_animation_tags = animation_tags if word_index == 0 else ""
-                        f.write(f"Dialogue: 0,{word_start},{word_end},{style_name},,0,0,0,,{final_animation_tags}{highlighted_text}\n")
-                else:
-                    # Write the base subtitle line without highlighting
-                    # Add animation effects if enabled
-                    animation_tags = ""
-                    if hasattr(current_style, 'animation') and current_style.animation != 'none':
-                        animation_tags = get_animation_tags(current_style.animation, current_style)
-                    
-                    f.write(f"Dialogue: 0,{start_time},{end_time},{style_name},,0,0,0,,{animation_tags}{text}\n")
+                        parts.extend((_DIALOGUE_HEAD.format(word_start, word_end, style_name), final_animation_tags, highlighted_text, "\n"))
+            else:
+                # Write the base subtitle line without highlighting, with animation effects if enabled
+                parts.extend((_DIALOGUE_HEAD.format(start_time, end_time, style_name), plan.animation_tags, text, "\n"))
+
+        with open(ass_path, "wb") as f:
+            f.write("".join(parts).encode("utf-8"))
 
         # Write SRT file if requested
         if config.output_srt and srt_path:
-            with open(srt_path, "w", encoding="utf-8") as srt:
-                for i, subtitle in enumerate(subtitle_groups, 1):
-                    start_time = format_timedelta(timedelta(seconds=subtitle["start"]))
-                    end_time = format_timedelta(timedelta(seconds=subtitle["end"]))
-                    speaker_prefix = f"[{subtitle['speaker']}] " if subtitle["speaker"] else ""
-                    srt.write(f"{i}\n{start_time} --> {end_time}\n{speaker_prefix}{subtitle['text']}\n\n")
+            srt_parts = []
+            for i, subtitle in enumerate(subtitle_groups, 1):
+                start_time = format_timedelta(timedelta(seconds=subtitle["start"]))
+                end_time = format_timedelta(timedelta(seconds=subtitle["end"]))
+                speaker_prefix = f"[{subtitle['speaker']}] " if subtitle["speaker"] else ""
+                srt_parts.append(f"{i}\n{start_time} --> {end_time}\n{speaker_prefix}{subtitle['text']}\n\n")
+            with open(srt_path, "wb") as srt:
+                srt.write("".join(srt_parts).encode("utf-8"))
 
         subtitles_path[path] = ass_path
 
@@ -1,14 +1,19 @@
-from dataclasses import dataclass, field
-from typing import Dict, Optional, List
-from enum import Enum
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, List, Tuple
+from enum import Enum, unique
+import functools
+import logging
 import random
 
+logger = logging.getLogger(__name__)
+
+@unique
 class SubtitlePosition(Enum):
-    """Subtitle positioning options for ASS format."""
+    """Subtitle positioning options for ASS format (numpad alignment values)."""
     BOTTOM_CENTER = 2
     BOTTOM_LEFT = 1
     BOTTOM_RIGHT = 3
-    MIDDLE_LEFT = 9
+    MIDDLE_LEFT = 4
     MIDDLE_CENTER = 5
     MIDDLE_RIGHT = 6
     TOP_LEFT = 7
@@ -51,7 +56,36 @@ class AnimationStyle(Enum):
     BOUNCE = "bounce"
     PULSE = "pulse"
 
-@dataclass
+# Style overrides for each text effect, given the style they're applied to
+_TEXT_EFFECTS = {
+    TextEffect.GLOW: lambda style: {
+        "outline_width": 5.0,
+        "shadow_distance": 0.0,
+        "outline_color": style.primary_color,
+    },
+    TextEffect.SHADOW: lambda style: {
+        "outline_width": 0.0,
+        "shadow_distance": 4.0,
+    },
+    TextEffect.OUTLINE: lambda style: {
+        "outline_width": style.outline_width,
+        "shadow_distance": 1.0,
+    },
+    TextEffect.OUTLINE_GLOW: lambda style: {
+        "outline_width": style.outline_width + 2.0,
+        "shadow_distance": 0.0,
+    },
+    TextEffect.DOUBLE_OUTLINE: lambda style: {
+        "outline_width": style.outline_width * 1.5,
+        "shadow_distance": 2.0,
+    },
+    TextEffect.DROP_SHADOW: lambda style: {
+        "outline_width": 2.0,
+        "shadow_distance": 6.0,
+    },
+}
+
+@dataclass(slots=True)
 class SpeakerStyle:
     """Configuration for individual speaker subtitle styling with viral video options."""
     # Font settings
@@ -127,7 +161,6 @@ class SpeakerStyle:
         # Handle transparent colors
         primary_color = "&H00000000" if self.primary_color == "transparent" else self.primary_color
         outline_color = "&H00000000" if self.outline_color == "transparent" else self.outline_color
-        shadow_color = "&H00000000" if self.shadow_color == "transparent" else self.shadow_color
         background_color = "&H00000000" if self.background_color == "transparent" else self.background_color
         
         # ASS format: PrimaryColour, SecondaryColour, OutlineColour, BackColour
@@ -141,48 +174,15 @@ class SpeakerStyle:
             f"{alignment},{self.margin_left},{self.margin_right},{self.margin_vertical},1"
         )
         
-        print(f"DEBUG: Generated ASS style for {style_name}: {style_line}")
+        logger.debug("Generated ASS style for %s: %s", style_name, style_line)
         return style_line
     
     def apply_text_effect(self) -> Dict[str, float]:
         """Apply specific text effects based on chosen effect type."""
-        effects = {}
-        
-        if self.text_effect == TextEffect.GLOW:
-            effects.update({
-                "outline_width": 5.0,
-                "shadow_distance": 0.0,
-                "outline_color": self.primary_color,
-            })
-        elif self.text_effect == TextEffect.SHADOW:
-            effects.update({
-                "outline_width": 0.0,
-                "shadow_distance": 4.0,
-            })
-        elif self.text_effect == TextEffect.OUTLINE:
-            effects.update({
-                "outline_width": self.outline_width,
-                "shadow_distance": 1.0,
-            })
-        elif self.text_effect == TextEffect.OUTLINE_GLOW:
-            effects.update({
-                "outline_width": self.outline_width + 2.0,
-                "shadow_distance": 0.0,
-            })
-        elif self.text_effect == TextEffect.DOUBLE_OUTLINE:
-            effects.update({
-                "outline_width": self.outline_width * 1.5,
-                "shadow_distance": 2.0,
-            })
-        elif self.text_effect == TextEffect.DROP_SHADOW:
-            effects.update({
-                "outline_width": 2.0,
-                "shadow_distance": 6.0,
-            })
-        
-        return effects
+        effect = _TEXT_EFFECTS.get(self.text_effect)
+        return effect(self) if effect else {}
 
-@dataclass 
+@dataclass(slots=True)
 class SubtitleConfig:
     """Main configuration for subtitle generation."""
     max_words_per_subtitle: int = 4
@@ -192,6 +192,7 @@ class SubtitleConfig:
     enable_speaker_detection: bool = False
     output_srt: bool = False
     enable_word_highlighting: bool = True  # Enable word highlighting by default
+    karaoke_tags: bool = False  # Highlight with one \k karaoke line per subtitle instead of one line per word
     
     def get_speaker_style(self, speaker_id: Optional[str] = None) -> SpeakerStyle:
         """Get style for a specific speaker, or default if not found."""
@@ -216,19 +217,14 @@ class SubtitleConfig:
     
     def _create_highlight_style(self, base_style: SpeakerStyle) -> SpeakerStyle:
         """Create a highlight version of a style for word highlighting."""
-        from copy import deepcopy
-        highlight_style = deepcopy(base_style)
-        
-        # Override colors and formatting for highlighting
-        if hasattr(base_style, 'highlight_color'):
-            highlight_style.primary_color = base_style.highlight_color
-        if hasattr(base_style, 'highlight_outline_color'):
-            highlight_style.outline_color = base_style.highlight_outline_color
-        if hasattr(base_style, 'highlight_bold'):
-            highlight_style.bold = base_style.highlight_bold
-        
-            
-        return highlight_style
+        # Every field is an immutable scalar, enum or string, so a shallow copy
+        # with the colors and formatting overridden is enough
+        return replace(
+            base_style,
+            primary_color=base_style.highlight_color,
+            outline_color=base_style.highlight_outline_color,
+            bold=base_style.highlight_bold
+        )
 
 def create_default_config() -> SubtitleConfig:
     """Create a default subtitle configuration."""
@@ -245,20 +241,23 @@ def create_default_config() -> SubtitleConfig:
         )
     )
 
+# Distinct speaker colors handed out before falling back to random ones
+_BASE_SPEAKER_COLORS = (
+    "&H000000FF",  # Red
+    "&H0000FF00",  # Green  
+    "&H00FF0000",  # Blue
+    "&H0000FFFF",  # Yellow
+    "&H00FF00FF",  # Magenta
+    "&H00FFFF00",  # Cyan
+    "&H004080FF",  # Orange
+    "&H008000FF",  # Purple
+    "&H0000FF80",  # Lime
+    "&H00FF8000",  # Pink
+)
+
 def generate_random_colors(num_speakers: int) -> List[str]:
     """Generate a list of random, distinct colors for speakers in ASS format."""
-    colors = [
-        "&H000000FF",  # Red
-        "&H0000FF00",  # Green  
-        "&H00FF0000",  # Blue
-        "&H0000FFFF",  # Yellow
-        "&H00FF00FF",  # Magenta
-        "&H00FFFF00",  # Cyan
-        "&H004080FF",  # Orange
-        "&H008000FF",  # Purple
-        "&H0000FF80",  # Lime
-        "&H00FF8000",  # Pink
-    ]
+    colors = list(_BASE_SPEAKER_COLORS[:num_speakers])
     
     # If we need more colors than predefined, generate random ones
     while len(colors) < num_speakers:
@@ -268,18 +267,21 @@ def generate_random_colors(num_speakers: int) -> List[str]:
         ass_color = f"&H00{b:02X}{g:02X}{r:02X}"
         colors.append(ass_color)
     
-    return colors[:num_speakers]
+    return colors
 
+@functools.lru_cache(maxsize=256)
 def hex_to_ass_color(hex_color: str) -> str:
-    """Convert hex color (#RRGGBB) to ASS format (&H00BBGGRR)."""
+    """Convert hex color (#RRGGBB) to ASS format (&H00BBGGRR); cached since palettes repeat."""
     if hex_color == 'transparent' or hex_color == '':
         return 'transparent'
     
     if hex_color.startswith('#') and len(hex_color) == 7:
-        r = hex_color[1:3]
-        g = hex_color[3:5]
-        b = hex_color[5:7]
-        return f"&H00{b}{g}{r}".upper()
+        # Parse RRGGBB once and re-emit the bytes in BBGGRR order
+        try:
+            rgb = int(hex_color[1:], 16) & 0xFFFFFF
+        except ValueError:
+            return "&H00FFFFFF"
+        return f"&H00{rgb & 0xFF:02X}{(rgb >> 8) & 0xFF:02X}{rgb >> 16:02X}"
     
     # If already in ASS format, return as is
     if hex_color.startswith('&H'):
@@ -310,7 +312,7 @@ def create_auto_speaker_config(detected_speakers: List[str]) -> SubtitleConfig:
             highlight_color="&H0000FFFF"  # Yellow highlight by default
         )
         config.add_speaker_style(speaker_id, style)
-        print(f"DEBUG: Assigned {colors[i]} color to {speaker_id}")
+        logger.debug("Assigned %s color to %s", colors[i], speaker_id)
     
     return config
 
@@ -432,20 +434,25 @@ def create_viral_preset_styles() -> Dict[str, SpeakerStyle]:
     
     return presets
 
-def get_viral_color_palette() -> List[str]:
+_VIRAL_COLOR_PALETTE = (
+    "&H00FFFFFF",  # White (classic)
+    "&H0000FFFF",  # Yellow (attention-grabbing)
+    "&H0000FF00",  # Green (gaming/tech)
+    "&H00FF0000",  # Blue (professional)
+    "&H00FF00FF",  # Magenta (trendy)
+    "&H0000FF80",  # Lime (energetic)
+    "&H00FF8000",  # Pink (playful)
+    "&H004080FF",  # Orange (warm)
+    "&H008000FF",  # Purple (creative)
+    "&H00FFFF00",  # Cyan (cool)
+)
+
+def get_viral_color_palette() -> Tuple[str, ...]:
     """Get popular colors for viral video content in ASS format."""
-    return [
-        "&H00FFFFFF",  # White (classic)
-        "&H0000FFFF",  # Yellow (attention-grabbing)
-        "&H0000FF00",  # Green (gaming/tech)
-        "&H00FF0000",  # Blue (professional)
-        "&H00FF00FF",  # Magenta (trendy)
-        "&H0000FF80",  # Lime (energetic)
-        "&H00FF8000",  # Pink (playful)
-        "&H004080FF",  # Orange (warm)
-        "&H008000FF",  # Purple (creative)
-        "&H00FFFF00",  # Cyan (cool)
-    ]
+    return _VIRAL_COLOR_PALETTE
+
+# Lowercase position names, for the web interface's position strings
+_POSITIONS_BY_NAME = {position.name.lower(): position for position in SubtitlePosition}
 
 def create_multi_speaker_config(speaker_configs: List[Dict]) -> SubtitleConfig:
     """Create configuration for multiple speakers from web interface data.
@@ -461,24 +468,12 @@ def create_multi_speaker_config(speaker_configs: List[Dict]) -> SubtitleConfig:
         speaker_id = speaker_config.get('speaker_id', 'default')
         
         # Convert hex color to ASS format if needed
-        color = speaker_config.get('color', '#FFFFFF')
-        if color.startswith('#'):
-            # Convert #RRGGBB to &H00BBGGRR (ASS format)
-            hex_color = color[1:]  # Remove #
-            if len(hex_color) == 6:
-                r, g, b = hex_color[0:2], hex_color[2:4], hex_color[4:6]
-                ass_color = f"&H00{b}{g}{r}".upper()
-            else:
-                ass_color = "&H00FFFFFF"  # Default to white
-        else:
-            ass_color = color
+        ass_color = hex_to_ass_color(speaker_config.get('color', '#FFFFFF'))
         
         # Convert position string to enum
-        position_str = speaker_config.get('position', 'bottom_center').upper()
-        try:
-            position = SubtitlePosition[position_str]
-        except KeyError:
-            position = SubtitlePosition.BOTTOM_CENTER
+        position = _POSITIONS_BY_NAME.get(
+            speaker_config.get('position', 'bottom_center').lower(), SubtitlePosition.BOTTOM_CENTER
+        )
         
         style = SpeakerStyle(
             font_family=FontFamily.ARIAL,  # Use enum
@@ -1,57 +1,114 @@
 import whisperx
+import functools
 import gc
+import logging
 import torch
 
-def word_transcribe(audio_file, model="medium", device="cuda", batch_size=16, compute_type="float16", language="", enable_diarization=False, hf_token=None):
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_model(name, device, compute_type, language):
+    """
+    Load a whisper model, keeping the most recent one so later calls in the same
+    process skip reloading it unless they pass release_models. Only one is kept so
+    switching models doesn't pile them up in GPU memory. With language=None the
+    pipeline detects the language again on every transcribe call.
+    """
+    return whisperx.load_model(name, device, compute_type=compute_type, language=language)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_align_model(language_code, device):
+    """Load an alignment model, keeping the most recent one like _load_model."""
+    return whisperx.load_align_model(language_code=language_code, device=device)
+
+
+def word_transcribe(audio_file, model="medium", device="cuda", batch_size=16, compute_type="float16", language="", enable_diarization=False, hf_token=None, release_models=False):
     """
     Transcribe audio file using WhisperX with optional speaker diarization.
     
     Parameters:
-    - audio_file: Path to the audio file to transcribe.
+    - audio_file: Path to the audio file to transcribe, or an already decoded 16 kHz mono float32 array.
     - model: Choose between tiny.en, tiny, base.en, base, small.en, small, medium.en, medium, large-v1, large-v2, large-v3, large, distil-large-v2, distil-medium.en, distil-small.en, distil-large-v3, large-v3-turbo, turbo
     - device: Device to run the model on (e.g., "cuda" or "cpu").
     - batch_size: Batch size for transcription.
-    - compute_type: Type of computation (e.g., "float16" or "int8"). Recommended to use "int8" to run on CPU.
+    - compute_type: Type of computation (e.g., "float16" or "int8"). Recommended to use "int8" to run on CPU; on CUDA it runs as "int8_float16".
     - enable_diarization: Whether to enable speaker diarization.
     - hf_token: HuggingFace token for speaker diarization models.
+    - release_models: Free each model as soon as its stage is done instead of keeping it cached for the next call, lowering peak GPU memory.
     
     Returns:
     - result: Transcription result with optional speaker labels.
     """
+    return word_transcribe_batch(
+        [audio_file], model=model, device=device, batch_size=batch_size, compute_type=compute_type,
+        language=language, enable_diarization=enable_diarization, hf_token=hf_token,
+        release_models=release_models
+    )[0]
 
-    if compute_type == "int8" and device != "cpu":
-        device = "cpu"
+
+def word_transcribe_batch(audio_files, model="medium", device="cuda", batch_size=16, compute_type="float16", language="", enable_diarization=False, hf_token=None, release_models=False):
+    """
+    Transcribe several audio files with one set of loaded WhisperX models.
+    
+    The whisper model and the diarization pipeline are loaded once for the
+    whole batch and alignment models once per detected language, instead of
+    once per file; the whisper model and the last alignment model are also
+    reused by the next call with the same settings. Parameters are the same as
+    word_transcribe.
+    
+    Returns:
+    - results: Transcription results, in the same order as audio_files.
+    """
+
+    # CTranslate2's GPU int8 kernels compute in float16, so int8 on CUDA keeps the GPU
+    if compute_type == "int8" and device == "cuda":
+        compute_type = "int8_float16"
 
 
     # 1. Transcribe with original whisper (batched)
     # WhisperX doesn't accept "auto" - use None for auto-detection
-    print(f"DEBUG: Received language parameter: '{language}'")
+    logger.debug("Received language parameter: '%s'", language)
     whisper_language = None if language == "auto" or not language else language
-    print(f"DEBUG: Using whisper_language: {whisper_language}")
-    model = whisperx.load_model(model, device, compute_type=compute_type, language=whisper_language)
+    logger.debug("Using whisper_language: %s", whisper_language)
+    model = _load_model(model, device, compute_type, whisper_language)
 
     # save model to local path (optional)
     # model_dir = "/path/"
     # model = whisperx.load_model("large-v2", device, compute_type=compute_type, download_root=model_dir)
 
-    audio = whisperx.load_audio(audio_file)
-    result = model.transcribe(audio, batch_size=batch_size)
-    # print(result) # before alignment
+    audios = [whisperx.load_audio(audio_file) if isinstance(audio_file, str) else audio_file for audio_file in audio_files]
+    results = [model.transcribe(audio, batch_size=batch_size) for audio in audios]
+    # print(results) # before alignment
 
-    # delete model if low on GPU resources
-    # import gc; import torch; gc.collect(); torch.cuda.empty_cache(); del model
+    if release_models:
+        # Free the whisper model before any align model loads, so the two never share GPU memory
+        del model
+        _load_model.cache_clear()
+        gc.collect()
+        if device == "cuda":
+            torch.cuda.empty_cache()
 
-    # 2. Align whisper output
-    model_a, metadata = whisperx.load_align_model(language_code=result["language"], device=device)
-    result = whisperx.align(result["segments"], model_a, metadata, audio, device, return_char_alignments=False)
+    # 2. Align whisper output, loading each language's align model once
+    align_models = {}
+    for i, (audio, result) in enumerate(zip(audios, results)):
+        if result["language"] not in align_models:
+            align_models[result["language"]] = _load_align_model(result["language"], device)
+        model_a, metadata = align_models[result["language"]]
+        results[i] = whisperx.align(result["segments"], model_a, metadata, audio, device, return_char_alignments=False)
 
-    # print(result["segments"]) # after alignment
+    # print(results[0]["segments"]) # after alignment
 
-    # delete model if low on GPU resources
-    gc.collect(); torch.cuda.empty_cache(); del model_a
+    # Drop the batch's align models when low on GPU resources; only the last
+    # loaded one stays cached for the next call, unless models are released
+    del align_models
+    if release_models:
+        _load_align_model.cache_clear()
+    gc.collect(); torch.cuda.empty_cache()
 
     # 3. Assign speaker labels (optional)
-    print(f"DEBUG: enable_diarization={enable_diarization}, hf_token={'[PRESENT]' if hf_token else '[MISSING]'}")
+    logger.debug("enable_diarization=%s, hf_token=%s", enable_diarization, '[PRESENT]' if hf_token else '[MISSING]')
     if enable_diarization:
         if hf_token:
             try:
@@ -59,11 +116,12 @@ def word_transcribe(audio_file, model="medium", device="cuda", batch_size=16, co
                 print("Loading speaker diarization pipeline...")
                 diarize_model = whisperx.diarize.DiarizationPipeline(use_auth_token=hf_token, device=device)
                 
-                print("Running speaker diarization...")
-                diarize_segments = diarize_model(audio)
-                
-                print("Assigning speakers to words...")
-                result = whisperx.assign_word_speakers(diarize_segments, result)
+                for i, audio in enumerate(audios):
+                    print("Running speaker diarization...")
+                    diarize_segments = diarize_model(audio)
+                    
+                    print("Assigning speakers to words...")
+                    results[i] = whisperx.assign_word_speakers(diarize_segments, results[i])
                 
                 # Clean up diarization model
                 del diarize_model
@@ -78,16 +136,16 @@ def word_transcribe(audio_file, model="medium", device="cuda", batch_size=16, co
         else:
             # Simulate speaker detection for demo purposes
             print("Warning: No HF token provided, simulating speakers for demo")
-            total_duration = result["segments"][-1]["end"] if result["segments"] else 0
             
             # Simulate 2 speakers alternating every ~10 seconds
-            for segment in result["segments"]:
-                if "words" in segment:
-                    for word in segment["words"]:
-                        # Alternate speakers based on time
-                        speaker_id = "SPEAKER_00" if word["start"] % 20 < 10 else "SPEAKER_01"
-                        word["speaker"] = speaker_id
+            for result in results:
+                for segment in result["segments"]:
+                    if "words" in segment:
+                        for word in segment["words"]:
+                            # Alternate speakers based on time
+                            speaker_id = "SPEAKER_00" if word["start"] % 20 < 10 else "SPEAKER_01"
+                            word["speaker"] = speaker_id
             
             print(f"Simulated 2 speakers for demo purposes")
 
-    return result
\ No newline at end of file
+    return results
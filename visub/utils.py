@@ -1,7 +1,30 @@
 import os
+import functools
+import subprocess
 from typing import Iterator, TextIO
 from datetime import timedelta
 
+# Whisper language codes, plus "auto" for language detection
+LANGUAGES = (
+    "auto", "af", "am", "ar", "as", "az", "ba", "be", "bg", "bn", "bo", 
+    "br", "bs", "ca", "cs", "cy", "da", "de", "el", "en", "es", "et", 
+    "eu", "fa", "fi", "fo", "fr", "gl", "gu", "ha", "haw", "he", "hi", 
+    "hr", "ht", "hu", "hy", "id", "is", "it", "ja", "jw", "ka", "kk", 
+    "km", "kn", "ko", "la", "lb", "ln", "lo", "lt", "lv", "mg", "mi", 
+    "mk", "ml", "mn", "mr", "ms", "mt", "my", "ne", "nl", "nn", "no", 
+    "oc", "pa", "pl", "ps", "pt", "ro", "ru", "sa", "sd", "si", "sk", 
+    "sl", "sn", "so", "sq", "sr", "su", "sv", "sw", "ta", "te", "tg", 
+    "th", "tk", "tl", "tr", "tt", "uk", "ur", "uz", "vi", "yi", "yo", "zh"
+)
+
+# compute_type used when neither the caller nor VISUB_COMPUTE_TYPE sets one.
+# float16 halves weight/activation bytes on GPUs with negligible accuracy loss;
+# int8 is the fastest CPU kernel at a small accuracy cost. int8_float16 keeps
+# int8 weights with float16 compute and is the narrowest GPU option CTranslate2
+# offers (it has no float8 kernels).
+DEFAULT_COMPUTE_TYPES = {"cuda": "float16", "cpu": "int8"}
+
+
 def str2bool(string):
     string = string.lower()
     str2val = {"true": True, "false": False}
@@ -15,16 +38,9 @@ def str2bool(string):
 
 def format_timestamp(seconds: float, always_include_hours: bool = False):
     assert seconds >= 0, "non-negative timestamp expected"
-    milliseconds = round(seconds * 1000.0)
-
-    hours = milliseconds // 3_600_000
-    milliseconds -= hours * 3_600_000
-
-    minutes = milliseconds // 60_000
-    milliseconds -= minutes * 60_000
-
-    seconds = milliseconds // 1_000
-    milliseconds -= seconds * 1_000
+    hours, milliseconds = divmod(round(seconds * 1000.0), 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1_000)
 
     hours_marker = f"{hours:02d}:" if always_include_hours or hours > 0 else ""
     return f"{hours_marker}{minutes:02d}:{seconds:02d},{milliseconds:03d}"
@@ -42,13 +58,18 @@ def format_timestamp(seconds: float, always_include_hours: bool = False):
 #         )
 
 
+@functools.lru_cache(maxsize=4096)
 def ass_time(seconds: float) -> str:
-    """Convert seconds to ASS time format (H:MM:SS.cc)."""
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
+    """
+    Convert seconds to ASS time format (H:MM:SS.cc).
+
+    Cached because karaoke lines repeat times: each word ends exactly when the
+    next one starts.
+    """
+    minutes, s = divmod(seconds, 60)
+    h, m = divmod(int(minutes), 60)
     cs = int((seconds - int(seconds)) * 100)
-    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+    return f"{h}:{m:02d}:{int(s):02d}.{cs:02d}"
 
 def format_timedelta(td: timedelta) -> str:
     """Format timedelta to SRT time format (HH:MM:SS,mmm)."""
@@ -61,3 +82,63 @@ def format_timedelta(td: timedelta) -> str:
 
 def filename(path):
     return os.path.splitext(os.path.basename(path))[0]
+
+
+# Hardware H.264 encoders in order of preference, with their quality settings.
+# libx264 is the software fallback and is always available. HEVC is never
+# auto-detected and must be asked for explicitly.
+VIDEO_ENCODER_OPTIONS = {
+    "h264_nvenc": {"preset": "p4", "rc": "vbr", "cq": 22},
+    "h264_qsv": {"preset": "veryfast", "global_quality": 22},
+    "h264_videotoolbox": {"b:v": "6M"},
+    "libx264": {"preset": "veryfast", "crf": 20},
+    "hevc_nvenc": {"preset": "p4", "rc": "vbr", "cq": 24, "tag:v": "hvc1"},
+}
+
+@functools.cache
+def detect_video_encoder() -> str:
+    """
+    Return the first hardware H.264 encoder usable on this machine, or libx264.
+    
+    Probing runs ffmpeg a few times, so the result is kept for the process.
+    """
+    try:
+        listed = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return "libx264"
+
+    for encoder in VIDEO_ENCODER_OPTIONS:
+        if not encoder.startswith("h264_") or encoder not in listed:
+            continue
+        # Being compiled in doesn't mean the device is present, so try a tiny encode
+        try:
+            subprocess.run(
+                ["ffmpeg", "-hide_banner", "-loglevel", "error",
+                 "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                 "-c:v", encoder, "-f", "null", "-"],
+                capture_output=True, check=True, timeout=10
+            )
+        except (OSError, subprocess.SubprocessError):
+            continue
+        return encoder
+
+    return "libx264"
+
+
+# Audio codecs the MP4 muxer can hold as-is; anything else is re-encoded to AAC
+MP4_AUDIO_CODECS = frozenset({"aac", "mp3", "opus", "ac3", "alac"})
+
+def mp4_audio_codec(path) -> str:
+    """Return the -c:a value for muxing the audio of path into MP4: copy if it fits, else aac."""
+    try:
+        codec = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "stream=codec_name", "-of", "csv=p=0", path],
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "aac"
+    return "copy" if codec in MP4_AUDIO_CODECS else "aac"
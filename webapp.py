@@ -6,6 +6,7 @@ Installation:
 1. pip install fastapi uvicorn python-multipart redis celery
 2. Start Redis server: redis-server
 3. Start Celery worker: celery -A webapp.celery worker --loglevel=info
+   (or one worker per queue when TRANSCRIBE_QUEUE/RENDER_QUEUE are set)
 4. Run: uvicorn webapp:app --host 0.0.0.0 --port 8000
 
 Features:
@@ -17,26 +18,29 @@ Features:
 - Production logging and error handling
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks, Depends
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks, Depends, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, validator
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from pydantic_core import from_json, to_json
+from typing import List, Literal, Optional, Dict, Any, Set
+import hashlib
+import itertools
 import json
 import os
 import tempfile
+import time
 import uuid
 import shutil
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 import redis
-from celery import Celery
+from celery import Celery, chain
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
-from visub.api import VisubAPI
+from visub.api import COLOR_RE, VisubAPI
 
 # Configure logging
 logging.basicConfig(
@@ -54,8 +58,20 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6380/0")
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/tmp/visub_uploads")
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "500")) * 1024 * 1024  # 500MB default
 CLEANUP_INTERVAL = int(os.getenv("CLEANUP_INTERVAL", "3600"))  # 1 hour
+# How often the cleanup also scans UPLOAD_DIR for directories the job index misses
+CLEANUP_SCAN_INTERVAL = int(os.getenv("CLEANUP_SCAN_INTERVAL", "21600"))  # 6 hours
 FILE_RETENTION = int(os.getenv("FILE_RETENTION", "86400"))  # 24 hours
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read/write size when saving uploads
 HF_TOKEN = os.getenv("HF_TOKEN")
+# Free the WhisperX models after each job; set to false on a dedicated GPU
+# worker to keep them loaded between jobs
+RELEASE_MODELS = os.getenv("RELEASE_MODELS", "true").lower() != "false"
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+# Celery queues for the GPU-bound transcription and the ffmpeg-bound rendering.
+# Both default to Celery's default queue so a single worker runs everything;
+# set them apart to run e.g. `-Q gpu_transcribe -c 1` and `-Q cpu_render -c 8`
+TRANSCRIBE_QUEUE = os.getenv("TRANSCRIBE_QUEUE", "celery")
+RENDER_QUEUE = os.getenv("RENDER_QUEUE", "celery")
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -67,6 +83,40 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Reject uploads that declare a body larger than any allowed video before
+# receiving it; otherwise the whole body is spooled to disk by the form parser
+# before upload_video gets to check the file size
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/api/upload":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    try:
+                        length = int(value)
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        response = JSONResponse(status_code=400, content={"detail": "Invalid Content-Length header"})
+                        await response(scope, receive, send)
+                        return
+                    if length > self.max_body_size:
+                        response = JSONResponse(
+                            status_code=413,
+                            content={"detail": f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"}
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+# Added before CORS so rejections still carry CORS headers. The margin covers
+# the configuration fields and multipart framing around the video
+app.add_middleware(UploadSizeLimitMiddleware, max_body_size=MAX_FILE_SIZE + 1024 * 1024)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -76,8 +126,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Redis
-redis_client = redis.from_url(REDIS_URL)
+# Initialize Redis. The pool is shared by request handlers, the threadpool and
+# Celery tasks in this process; when it's exhausted callers wait for a free
+# connection instead of failing. Idle connections are kept alive and checked
+# before reuse so a Redis restart doesn't surface as request errors
+redis_pool = redis.BlockingConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=10,
+    socket_keepalive=True,
+    health_check_interval=30
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
 
 # Initialize Celery
 celery = Celery(
@@ -86,73 +146,106 @@ celery = Celery(
     backend=REDIS_URL,
     include=["webapp"]
 )
+celery.conf.task_routes = {
+    "webapp.transcribe_video_task": {"queue": TRANSCRIBE_QUEUE},
+    "webapp.render_video_task": {"queue": RENDER_QUEUE},
+}
 
 # Initialize Visub API
-visub_api = VisubAPI(temp_dir=UPLOAD_DIR)
-
-# Thread pool for CPU-bound tasks
-executor = ThreadPoolExecutor(max_workers=2)
+visub_api = VisubAPI(temp_dir=UPLOAD_DIR, release_models=RELEASE_MODELS)
+
+# The metadata endpoints serve constant data, so their JSON bodies are encoded
+# once here instead of on every request. The ETag is the body's hash, so it
+# only changes when a deploy changes the data and clients can revalidate with
+# a 304 instead of downloading the body again
+_METADATA_BODIES = {
+    key: json.dumps({key: getter()}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    for key, getter in (
+        ("models", visub_api.get_supported_models),
+        ("languages", visub_api.get_supported_languages),
+        ("positions", visub_api.get_supported_positions),
+        ("fonts", visub_api.get_viral_fonts),
+        ("effects", visub_api.get_text_effects),
+        ("animations", visub_api.get_animation_styles),
+        ("presets", visub_api.get_preset_styles),
+        ("colors", visub_api.get_color_palette),
+    )
+}
+_METADATA_RESPONSES = {
+    key: (body, f'"{hashlib.md5(body).hexdigest()}"')
+    for key, body in _METADATA_BODIES.items()
+}
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison (RFC 9110 13.1.2): "*" or any listed tag, W/ ignored."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+def metadata_response(request: Request, key: str) -> Response:
+    body, etag = _METADATA_RESPONSES[key]
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 # Models
+# Constraints are declared on the fields rather than in Python validators, so
+# pydantic-core checks them while parsing
+def _parse_config_form(model, value: str):
+    """Parse and validate a JSON form field in a single pydantic pass."""
+    try:
+        return model.model_validate_json(value)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            raise HTTPException(status_code=400, detail="Invalid JSON in configuration")
+        raise HTTPException(status_code=400, detail=f"Configuration validation error: {str(e)}")
+
+# Settings the models don't declare are kept, so the configuration handed to
+# visub is the one the client sent
 class SpeakerConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
     speaker_id: str
     font_family: str = "Arial"
-    font_size: int = 30
-    color: str = "#FFFFFF"
+    font_size: int = Field(30, ge=8, le=100)
+    # Hex (#RRGGBB) or ASS format (&HBBGGRR with optional alpha byte), as visub accepts
+    color: str = Field("#FFFFFF", pattern=COLOR_RE.pattern)
     position: str = "bottom_center"
     bold: bool = False
     italic: bool = False
 
-    @validator('font_size')
-    def validate_font_size(cls, v):
-        if not 8 <= v <= 100:
-            raise ValueError('Font size must be between 8 and 100')
-        return v
-
-    @validator('color')
-    def validate_color(cls, v):
-        if v.startswith('#') and len(v) == 7:
-            try:
-                int(v[1:], 16)
-                return v
-            except ValueError:
-                raise ValueError('Invalid hex color format')
-        elif v.startswith('&H'):
-            return v
-        else:
-            raise ValueError('Color must be hex (#RRGGBB) or ASS format (&H00BBGGRR)')
-
 class SubtitleConfig(BaseModel):
-    max_words: int = 4
+    model_config = ConfigDict(extra="allow")
+
+    max_words: int = Field(4, ge=1, le=50)
     output_srt: bool = False
     enable_speaker_detection: bool = False
     speakers: List[SpeakerConfig] = []
 
-    @validator('max_words')
-    def validate_max_words(cls, v):
-        if not 1 <= v <= 50:
-            raise ValueError('Max words must be between 1 and 50')
-        return v
+    @classmethod
+    def as_form(cls, subtitle_config: str = Form(...)) -> "SubtitleConfig":
+        return _parse_config_form(cls, subtitle_config)
 
 class TranscriptionConfig(BaseModel):
-    model: str = "medium"
+    model_config = ConfigDict(extra="allow")
+
+    model: Literal[
+        "tiny", "tiny.en", "base", "base.en", "small", "small.en",
+        "medium", "medium.en", "large-v1", "large-v2", "large-v3",
+        "large", "distil-large-v2", "distil-medium.en", "distil-small.en",
+        "distil-large-v3", "large-v3-turbo", "turbo"
+    ] = "medium"
     language: str = "auto"
     device: str = "cuda"
     compute_type: str = "float16"
     batch_size: int = 16
     hf_token: Optional[str] = None
 
-    @validator('model')
-    def validate_model(cls, v):
-        valid_models = [
-            "tiny", "tiny.en", "base", "base.en", "small", "small.en",
-            "medium", "medium.en", "large-v1", "large-v2", "large-v3",
-            "large", "distil-large-v2", "distil-medium.en", "distil-small.en",
-            "distil-large-v3", "large-v3-turbo", "turbo"
-        ]
-        if v not in valid_models:
-            raise ValueError(f'Model must be one of: {valid_models}')
-        return v
+    @classmethod
+    def as_form(cls, transcription_config: Optional[str] = Form(None)) -> Optional["TranscriptionConfig"]:
+        return _parse_config_form(cls, transcription_config) if transcription_config else None
 
 class JobStatus(BaseModel):
     job_id: str
@@ -165,9 +258,28 @@ class JobStatus(BaseModel):
     error: Optional[str] = None
 
 # Job management
+# Jobs are Redis hashes of JSON-encoded fields, so an update writes only the
+# changed fields in one atomic round trip instead of a GET followed by a SETEX.
+# Updates to missing (expired or deleted) jobs are dropped, and every update
+# renews the retention TTL. Job ids are also indexed by creation time so the
+# cleanup finds expired jobs without stat-ing every directory in UPLOAD_DIR.
+_JOBS_BY_CREATED = "jobs:by_created"
+_DIRECTORY_SCAN_LOCK = "cleanup:directory_scan"
+_UPDATE_JOB_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+"""
+
 class JobManager:
     def __init__(self, redis_client):
         self.redis = redis_client
+        self._update_job = redis_client.register_script(_UPDATE_JOB_SCRIPT)
+    
+    @staticmethod
+    def _encode_fields(fields: Dict[str, Any]) -> Dict[str, bytes]:
+        return {key: to_json(value) for key, value in fields.items()}
     
     def create_job(self, job_id: str) -> JobStatus:
         job = JobStatus(
@@ -177,43 +289,104 @@ class JobManager:
             message="Job created",
             created_at=datetime.utcnow()
         )
-        self.redis.setex(f"job:{job_id}", FILE_RETENTION, job.json())
+        with self.redis.pipeline() as pipe:
+            pipe.hset(f"job:{job_id}", mapping=self._encode_fields(job.model_dump()))
+            pipe.expire(f"job:{job_id}", FILE_RETENTION)
+            pipe.zadd(_JOBS_BY_CREATED, {job_id: time.time()})
+            pipe.execute()
         return job
     
     def get_job(self, job_id: str) -> Optional[JobStatus]:
-        job_data = self.redis.get(f"job:{job_id}")
+        job_data = self.redis.hgetall(f"job:{job_id}")
         if job_data:
-            return JobStatus.parse_raw(job_data)
+            return JobStatus.model_validate({key.decode(): from_json(value) for key, value in job_data.items()})
         return None
     
     def update_job(self, job_id: str, **kwargs):
-        job = self.get_job(job_id)
-        if job:
-            for key, value in kwargs.items():
-                setattr(job, key, value)
-            self.redis.setex(f"job:{job_id}", FILE_RETENTION, job.json())
+        fields = self._encode_fields(kwargs)
+        if not fields:
+            return
+        self._update_job(
+            keys=[f"job:{job_id}"],
+            args=[FILE_RETENTION, *itertools.chain.from_iterable(fields.items())]
+        )
+    
+    def cache_result(self, cache_key: str, job_id: str):
+        """Remember job_id as the completed job for a result_cache_key."""
+        self.redis.set(cache_key, job_id, ex=FILE_RETENTION)
+    
+    def get_cached_result(self, cache_key: str) -> Optional[str]:
+        job_id = self.redis.get(cache_key)
+        return job_id.decode() if job_id else None
     
     def delete_job(self, job_id: str):
-        self.redis.delete(f"job:{job_id}")
+        with self.redis.pipeline() as pipe:
+            pipe.delete(f"job:{job_id}")
+            pipe.zrem(_JOBS_BY_CREATED, job_id)
+            pipe.execute()
+    
+    def pop_expired_jobs(self, cutoff: float) -> List[str]:
+        """Remove the jobs created before cutoff (a Unix time) and return their ids."""
+        job_ids = [job_id.decode() for job_id in self.redis.zrangebyscore(_JOBS_BY_CREATED, 0, cutoff)]
+        if job_ids:
+            with self.redis.pipeline() as pipe:
+                pipe.delete(*(f"job:{job_id}" for job_id in job_ids))
+                pipe.zrem(_JOBS_BY_CREATED, *job_ids)
+                pipe.execute()
+        return job_ids
+    
+    def claim_directory_scan(self) -> bool:
+        """Return True for at most one caller per CLEANUP_SCAN_INTERVAL, across all processes."""
+        return bool(self.redis.set(_DIRECTORY_SCAN_LOCK, 1, nx=True, ex=CLEANUP_SCAN_INTERVAL))
+    
+    def live_job_ids(self, cutoff: float) -> Set[str]:
+        """Return the ids of the indexed jobs created after cutoff (a Unix time)."""
+        return {job_id.decode() for job_id in self.redis.zrangebyscore(_JOBS_BY_CREATED, f"({cutoff}", "+inf")}
 
 job_manager = JobManager(redis_client)
 
-# Celery task
+# Celery tasks
+def fail_job(job_id: str, e: Exception):
+    logger.error(f"Job {job_id} failed: {str(e)}")
+    job_manager.update_job(
+        job_id,
+        status="failed",
+        progress=0.0,
+        message="Processing failed",
+        completed_at=datetime.utcnow(),
+        error=str(e)
+    )
+
 @celery.task(bind=True)
-def process_video_task(self, job_id: str, video_path: str, output_dir: str, 
-                      subtitle_config: dict, transcription_config: dict):
-    """Background task to process video."""
+def transcribe_video_task(self, job_id: str, video_path: str, output_dir: str, 
+                          subtitle_config: dict, transcription_config: dict):
+    """Background task to transcribe a video and write its subtitles."""
     try:
         job_manager.update_job(job_id, status="processing", progress=10.0, message="Starting processing")
         
-        # Process video
-        results = visub_api.process_video(
+        results = visub_api.generate_subtitles(
             video_path=video_path,
             output_dir=output_dir,
             subtitle_config=subtitle_config,
             transcription_config=transcription_config
         )
         
+        # render_video_task may wait behind other jobs on the render queue
+        job_manager.update_job(job_id, progress=55.0, message="Queued for rendering")
+        return results
+        
+    except Exception as e:
+        fail_job(job_id, e)
+        raise
+
+@celery.task(bind=True)
+def render_video_task(self, results: dict, job_id: str, output_dir: str, cache_key: Optional[str] = None):
+    """Background task to burn the subtitles written by transcribe_video_task into the video."""
+    try:
+        job_manager.update_job(job_id, progress=60.0, message="Rendering video")
+        
+        results = visub_api.burn_subtitles(results, output_dir)
+        
         job_manager.update_job(
             job_id,
             status="completed",
@@ -223,19 +396,14 @@ def process_video_task(self, job_id: str, video_path: str, output_dir: str,
             result=results
         )
         
+        if cache_key:
+            job_manager.cache_result(cache_key, job_id)
+        
         logger.info(f"Job {job_id} completed successfully")
         return results
         
     except Exception as e:
-        logger.error(f"Job {job_id} failed: {str(e)}")
-        job_manager.update_job(
-            job_id,
-            status="failed",
-            progress=0.0,
-            message="Processing failed",
-            completed_at=datetime.utcnow(),
-            error=str(e)
-        )
+        fail_job(job_id, e)
         raise
 
 # Health check
@@ -259,52 +427,125 @@ async def root():
     }
 
 @app.get("/api/models")
-async def get_supported_models():
-    return {"models": visub_api.get_supported_models()}
+async def get_supported_models(request: Request):
+    return metadata_response(request, "models")
 
 @app.get("/api/languages")
-async def get_supported_languages():
-    return {"languages": visub_api.get_supported_languages()}
+async def get_supported_languages(request: Request):
+    return metadata_response(request, "languages")
 
 @app.get("/api/positions")
-async def get_supported_positions():
-    return {"positions": visub_api.get_supported_positions()}
+async def get_supported_positions(request: Request):
+    return metadata_response(request, "positions")
 
 @app.get("/api/fonts")
-async def get_viral_fonts():
-    return {"fonts": visub_api.get_viral_fonts()}
+async def get_viral_fonts(request: Request):
+    return metadata_response(request, "fonts")
 
 @app.get("/api/effects")
-async def get_text_effects():
-    return {"effects": visub_api.get_text_effects()}
+async def get_text_effects(request: Request):
+    return metadata_response(request, "effects")
 
 @app.get("/api/animations")
-async def get_animation_styles():
-    return {"animations": visub_api.get_animation_styles()}
+async def get_animation_styles(request: Request):
+    return metadata_response(request, "animations")
 
 @app.get("/api/presets")
-async def get_preset_styles():
-    return {"presets": visub_api.get_preset_styles()}
+async def get_preset_styles(request: Request):
+    return metadata_response(request, "presets")
 
 @app.get("/api/colors")
-async def get_color_palette():
-    return {"colors": visub_api.get_color_palette()}
+async def get_color_palette(request: Request):
+    return metadata_response(request, "colors")
 
 @app.post("/api/validate-config")
 async def validate_config(config: SubtitleConfig):
     try:
-        config_dict = config.dict()
+        config_dict = config.model_dump()
         validation_result = visub_api.validate_config(config_dict)
         return validation_result
     except Exception as e:
         logger.error(f"Config validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+def save_upload(upload: UploadFile, path: str) -> str:
+    """
+    Copy an upload to disk in UPLOAD_CHUNK_SIZE pieces and return the hex
+    digest of its content. Blocking, so run it off the event loop.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    upload.file.seek(0)
+    with open(path, "wb", buffering=UPLOAD_CHUNK_SIZE) as buffer:
+        # Reserve the whole file up front so the filesystem can lay it out in
+        # one extent instead of growing it a chunk at a time
+        if upload.size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(buffer.fileno(), 0, upload.size)
+            except OSError:
+                pass
+        while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            buffer.write(chunk)
+        # fallocate sets the file length, so drop any reserved space left unwritten
+        buffer.truncate()
+    return digest.hexdigest()
+
+# Re-uploading a video with the same settings reuses the earlier job's output
+# files instead of transcribing and rendering it again. The token value stays
+# out of the key, but whether diarization really runs is part of it: without a
+# token (here or in HF_TOKEN) visub simulates the speakers instead.
+def result_cache_key(video_digest: str, subtitle_config: dict, transcription_config: dict) -> str:
+    options = {key: value for key, value in transcription_config.items() if key != "hf_token"}
+    options["real_diarization"] = (
+        bool(transcription_config.get("hf_token") or HF_TOKEN)
+        and bool(subtitle_config.get("enable_speaker_detection"))
+    )
+    config_digest = hashlib.blake2b(json.dumps([subtitle_config, options], sort_keys=True).encode(), digest_size=16)
+    return f"result:{video_digest}:{config_digest.hexdigest()}"
+
+def reuse_job_outputs(source_job: JobStatus, job_dir: str, video_path: str) -> Optional[dict]:
+    """
+    Link a completed job's output files into job_dir and return its results
+    pointed at this job's upload (video_path) and outputs, or None if the
+    outputs are gone. Blocking.
+    """
+    source_dir = os.path.join(UPLOAD_DIR, source_job.job_id)
+    source_output = os.path.join(source_dir, "output")
+    linked = []
+    try:
+        with os.scandir(source_output) as entries:
+            files = [entry for entry in entries if entry.is_file()]
+        for entry in files:
+            target = os.path.join(job_dir, "output", entry.name)
+            try:
+                os.link(entry.path, target)
+            except OSError:
+                shutil.copy2(entry.path, target)
+            linked.append(target)
+    except OSError:
+        # Don't leave a partial set of outputs behind for the normal run
+        for target in linked:
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+        return None
+    
+    def relocate(path):
+        return os.path.join(job_dir, os.path.relpath(path, source_dir))
+    
+    # Each job processes its one upload, so every original path is this job's video
+    results = dict(source_job.result)
+    results["video_path"] = video_path
+    for key in ("subtitle_files", "video_files"):
+        results[key] = {video_path: relocate(output) for output in results[key].values()}
+    return results
+
 @app.post("/api/upload")
 async def upload_video(
     video_file: UploadFile = File(...),
-    subtitle_config: str = Form(...),
-    transcription_config: Optional[str] = Form(None)
+    subtitle_config: SubtitleConfig = Depends(SubtitleConfig.as_form),
+    transcription_config: Optional[TranscriptionConfig] = Depends(TranscriptionConfig.as_form)
 ):
     """Upload video and start processing job."""
     
@@ -318,20 +559,9 @@ async def upload_video(
             detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024*1024)}MB"
         )
     
-    # Parse and validate configurations
-    try:
-        subtitle_config_dict = json.loads(subtitle_config)
-        transcription_config_dict = json.loads(transcription_config) if transcription_config else {}
-        
-        # Validate using Pydantic models
-        SubtitleConfig(**subtitle_config_dict)
-        if transcription_config_dict:
-            TranscriptionConfig(**transcription_config_dict)
-            
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON in configuration")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Configuration validation error: {str(e)}")
+    # Only the fields the client set, so visub applies its own defaults for the rest
+    subtitle_config_dict = subtitle_config.model_dump(exclude_unset=True)
+    transcription_config_dict = transcription_config.model_dump(exclude_unset=True) if transcription_config else {}
     
     # Create job
     job_id = str(uuid.uuid4())
@@ -344,21 +574,43 @@ async def upload_video(
         
         # Save uploaded video
         video_path = os.path.join(job_dir, f"input_{video_file.filename}")
-        with open(video_path, "wb") as buffer:
-            content = await video_file.read()
-            buffer.write(content)
+        video_digest = await asyncio.to_thread(save_upload, video_file, video_path)
         
         output_dir = os.path.join(job_dir, "output")
         os.makedirs(output_dir, exist_ok=True)
         
-        # Start background processing
-        process_video_task.delay(
-            job_id=job_id,
-            video_path=video_path,
-            output_dir=output_dir,
-            subtitle_config=subtitle_config_dict,
-            transcription_config=transcription_config_dict
-        )
+        cache_key = result_cache_key(video_digest, subtitle_config_dict, transcription_config_dict)
+        cached_job_id = job_manager.get_cached_result(cache_key)
+        cached_job = job_manager.get_job(cached_job_id) if cached_job_id else None
+        if cached_job and cached_job.status == "completed" and cached_job.result:
+            results = await asyncio.to_thread(reuse_job_outputs, cached_job, job_dir, video_path)
+            if results is not None:
+                job_manager.update_job(
+                    job_id,
+                    status="completed",
+                    progress=100.0,
+                    message="Processing completed",
+                    completed_at=datetime.utcnow(),
+                    result=results
+                )
+                logger.info(f"Job {job_id} reused the results of job {cached_job_id}")
+                return {
+                    "job_id": job_id,
+                    "status": "accepted",
+                    "message": "Video uploaded and processing started"
+                }
+        
+        # Start background processing: transcription, then rendering on its own queue
+        chain(
+            transcribe_video_task.s(
+                job_id=job_id,
+                video_path=video_path,
+                output_dir=output_dir,
+                subtitle_config=subtitle_config_dict,
+                transcription_config=transcription_config_dict
+            ),
+            render_video_task.s(job_id=job_id, output_dir=output_dir, cache_key=cache_key)
+        ).apply_async()
         
         logger.info(f"Started processing job {job_id} for file {video_file.filename}")
         
@@ -371,19 +623,25 @@ async def upload_video(
     except Exception as e:
         # Clean up on error
         job_dir = os.path.join(UPLOAD_DIR, job_id)
-        if os.path.exists(job_dir):
-            shutil.rmtree(job_dir, ignore_errors=True)
+        await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
         job_manager.delete_job(job_id)
         
         logger.error(f"Upload failed for job {job_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-@app.get("/api/status/{job_id}")
+# Polled by clients while a job runs; pydantic's own serializer is much cheaper
+# than FastAPI's generic jsonable_encoder pass over the model
+@app.get("/api/status/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     job = job_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return Response(job.model_dump_json(), media_type="application/json")
+
+class DownloadResponse(FileResponse):
+    # Rendered videos run to hundreds of MB; Starlette's 64KB default means a
+    # read and a send per 64KB. Range requests work the same either way
+    chunk_size = 1024 * 1024
 
 @app.get("/api/download/{job_id}/{file_type}")
 async def download_file(job_id: str, file_type: str):
@@ -402,23 +660,31 @@ async def download_file(job_id: str, file_type: str):
     
     # Find the requested file
     file_path = None
-    file_extension = {"ass": ".ass", "srt": ".srt", "video": ".mp4"}
+    file_types = {
+        "ass": (".ass", "text/x-ssa"),
+        "srt": (".srt", "application/x-subrip"),
+        "video": (".mp4", "video/mp4"),
+    }
     
-    if file_type not in file_extension:
+    if file_type not in file_types:
         raise HTTPException(status_code=400, detail="Invalid file type")
+    extension, media_type = file_types[file_type]
     
-    for file in os.listdir(output_dir):
-        if file.endswith(file_extension[file_type]):
-            file_path = os.path.join(output_dir, file)
-            break
+    # The listing's stat is handed to the response so the file isn't stat-ed twice
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(extension) and entry.is_file():
+                file_path, stat_result = entry.path, entry.stat()
+                break
     
-    if not file_path or not os.path.exists(file_path):
+    if not file_path:
         raise HTTPException(status_code=404, detail=f"File type '{file_type}' not found")
     
-    return FileResponse(
+    return DownloadResponse(
         file_path,
-        media_type='application/octet-stream',
-        filename=os.path.basename(file_path)
+        media_type=media_type,
+        filename=os.path.basename(file_path),
+        stat_result=stat_result
     )
 
 @app.delete("/api/jobs/{job_id}")
@@ -429,8 +695,7 @@ async def delete_job(job_id: str):
     
     # Clean up files
     job_dir = os.path.join(UPLOAD_DIR, job_id)
-    if os.path.exists(job_dir):
-        shutil.rmtree(job_dir, ignore_errors=True)
+    await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
     
     # Remove from Redis
     job_manager.delete_job(job_id)
@@ -447,17 +712,27 @@ async def cleanup_old_jobs(background_tasks: BackgroundTasks):
 def cleanup_expired_jobs():
     """Remove expired jobs and their files."""
     try:
-        cutoff_time = datetime.utcnow() - timedelta(seconds=FILE_RETENTION)
+        cutoff_time = time.time() - FILE_RETENTION
         
-        # Find expired job directories
-        for item in os.listdir(UPLOAD_DIR):
-            item_path = os.path.join(UPLOAD_DIR, item)
-            if os.path.isdir(item_path):
-                # Check if directory is old enough
-                creation_time = datetime.fromtimestamp(os.path.getctime(item_path))
-                if creation_time < cutoff_time:
-                    shutil.rmtree(item_path, ignore_errors=True)
-                    logger.info(f"Cleaned up expired job directory: {item}")
+        for job_id in job_manager.pop_expired_jobs(cutoff_time):
+            shutil.rmtree(os.path.join(UPLOAD_DIR, job_id), ignore_errors=True)
+            logger.info(f"Cleaned up expired job directory: {job_id}")
+        
+        # Fall back to the directory mtime for whatever the index doesn't know:
+        # jobs from before it existed, uploads that failed before their entry
+        # was written, directories left after a Redis flush and visub's
+        # transcription cache (which also lives in UPLOAD_DIR but isn't a job).
+        # The scan stats every directory, so it runs once per
+        # CLEANUP_SCAN_INTERVAL among all processes rather than on every pass
+        if job_manager.claim_directory_scan():
+            live_ids = job_manager.live_job_ids(cutoff_time)
+            with os.scandir(UPLOAD_DIR) as entries:
+                for entry in entries:
+                    if entry.name in live_ids or not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                        logger.info(f"Cleaned up expired directory: {entry.name}")
         
         logger.info("Cleanup completed")
         
@@ -469,6 +744,13 @@ def cleanup_expired_jobs():
 async def startup_event():
     logger.info("Visub API starting up...")
     
+    # Handlers must hand blocking work to asyncio.to_thread and heavy work to
+    # Celery. asyncio only reports slow callbacks in debug mode, so with
+    # PYTHONASYNCIODEBUG=1 warn about any that hold the event loop over 100ms
+    loop = asyncio.get_running_loop()
+    if loop.get_debug():
+        loop.slow_callback_duration = 0.1
+    
     # Test Redis connection
     try:
         redis_client.ping()
@@ -476,24 +758,33 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Redis connection failed: {e}")
     
-    # Schedule periodic cleanup
-    import threading
-    def periodic_cleanup():
+    # Schedule periodic cleanup; the loop mostly sleeps on the event loop and
+    # only borrows a pool thread while a cleanup pass runs
+    async def periodic_cleanup():
         while True:
-            cleanup_expired_jobs()
-            threading.Event().wait(CLEANUP_INTERVAL)
+            await asyncio.to_thread(cleanup_expired_jobs)
+            await asyncio.sleep(CLEANUP_INTERVAL)
     
-    cleanup_thread = threading.Thread(target=periodic_cleanup, daemon=True)
-    cleanup_thread.start()
+    app.state.cleanup_task = asyncio.create_task(periodic_cleanup())
     
     logger.info("Visub API startup complete")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.cleanup_task.cancel()
+
 if __name__ == "__main__":
     import uvicorn
+    # uvloop and httptools come with uvicorn[standard]. Each worker imports the
+    # whole transcription stack, so the worker count is opt-in via WEB_CONCURRENCY
     uvicorn.run(
         "webapp:app",
         host="0.0.0.0",
         port=8000,
-        workers=1,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
         log_level="info"
     )
\ No newline at end of file